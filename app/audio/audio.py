@@ -174,11 +174,15 @@ class AudioGenerator:
         """
         self.logger.debug(f"Worker thread started")
         
-        while not work_queue.empty():
+        while True:
+            # Get a segment from the work queue without blocking, as another worker or a cancellation
+            # may take the last one between an empty() check and a blocking get()
+            try:
+                segment_text, segment_info = work_queue.get_nowait()
+            except queue.Empty:
+                break
+            
             try:
-                # Get a segment from the work queue
-                segment_text, segment_info = work_queue.get()
-                
                 # Process the segment
                 result = self._process_text_segment(segment_text, temp_dir, language, voice_path, segment_info)
                 
@@ -393,6 +397,20 @@ class AudioGenerator:
         
         return threads
     
+    def _discard_work(self, work_queue: queue.Queue) -> None:
+        """
+        Remove all segments that have not been picked up by a worker yet.
+        
+        Args:
+            work_queue: Queue containing text segments to process
+        """
+        while True:
+            try:
+                work_queue.get_nowait()
+            except queue.Empty:
+                break
+            work_queue.task_done()
+    
     def _monitor_progress(self, result_queue: queue.Queue, total_segments: int, 
                          progress_callback: Optional[Callable[[int, str], None]] = None) -> List[Tuple[Tuple[int, int], str, int, bool]]:
         """
@@ -464,6 +482,7 @@ class AudioGenerator:
         # Generate an output filename
         output_filename = self._generate_output_filename(routine_name)
         output_path = os.path.join(OUTPUT_FOLDER, output_filename)
+        stopped = False
         
         try:
             # Create a temporary directory for segment audio files
@@ -488,7 +507,16 @@ class AudioGenerator:
                 )
                 
                 # Monitor progress and collect results
-                segment_files = self._monitor_progress(result_queue, len(segments), progress_callback)
+                try:
+                    segment_files = self._monitor_progress(result_queue, len(segments), progress_callback)
+                except BaseException:
+                    stopped = True
+                    # Discard the remaining segments so the workers stop after their current one,
+                    # and let them finish before the temporary directory is removed
+                    self._discard_work(work_queue)
+                    for thread in threads:
+                        thread.join()
+                    raise
                 
                 # Ensure all tasks are marked as done
                 work_queue.join()
@@ -506,7 +534,11 @@ class AudioGenerator:
             return output_filename
             
         except Exception as e:
-            self.logger.error(f"Error during audio generation: {str(e)}", exc_info=True)
+            if stopped:
+                # Raised by the progress callback (e.g. a cancellation), which the caller handles
+                self.logger.info("Audio generation stopped: %r", e)
+            else:
+                self.logger.error(f"Error during audio generation: {str(e)}", exc_info=True)
             raise
     
     def _generate_fallback_audio(self, output_path: str, language: str, voice_path: str) -> None:
@@ -1,14 +1,23 @@
 import logging
 import os
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QProgressBar, QGroupBox, QTextEdit, QApplication, QMessageBox
+    QProgressBar, QGroupBox, QPlainTextEdit, QMessageBox
 )
 
+# Maximum number of lines kept in the generation log
+LOG_MAX_BLOCK_COUNT = 2000
+
+# Minimum interval in milliseconds between progress updates of the widgets
+PROGRESS_UPDATE_INTERVAL = 50
+
 class CollapsibleSection(QGroupBox):
     """A collapsible section widget that can be expanded or collapsed."""
 
+    # Signal emitted when the section is expanded
+    expanded = pyqtSignal()
+
     def __init__(self, title, parent=None):
         super().__init__(title, parent)
         self.setCheckable(True)
@@ -27,10 +36,13 @@ class CollapsibleSection(QGroupBox):
         self.content_visible = False
         self.update_collapse_state()
 
+    @pyqtSlot(bool)
     def on_toggle(self, checked):
         """Handle toggle event."""
         self.content_visible = checked
         self.update_collapse_state()
+        if checked:
+            self.expanded.emit()
 
     def update_collapse_state(self):
         """Update the visibility of content based on collapse state."""
@@ -58,6 +70,16 @@ class GenerationDialog(QDialog):
         # Store task manager
         self.task_manager = task_manager
 
+        # Last (progress, message) shown, to skip repeated updates
+        self._last_progress = None
+
+        # Latest progress not shown yet, flushed to the widgets by a timer
+        self._pending_progress = None
+        self._ui_timer = QTimer(self)
+        self._ui_timer.setInterval(PROGRESS_UPDATE_INTERVAL)
+        self._ui_timer.setSingleShot(True)
+        self._ui_timer.timeout.connect(self._flush_progress)
+
         # Set window properties
         self.setWindowTitle("Generating Audio")
         self.setMinimumSize(QSize(500, 300))
@@ -74,12 +96,13 @@ class GenerationDialog(QDialog):
         # Create the button bar
         self.setup_button_bar()
 
-        # Connect task manager signals
+        # Connect task manager signals (queued, as they are emitted from the task thread)
         if self.task_manager:
-            self.task_manager.task_started.connect(self.on_task_started)
-            self.task_manager.task_progress.connect(self.on_task_progress)
-            self.task_manager.task_completed.connect(self.on_task_completed)
-            self.task_manager.task_failed.connect(self.on_task_failed)
+            queued = Qt.ConnectionType.QueuedConnection
+            self.task_manager.task_started.connect(self.on_task_started, queued)
+            self.task_manager.task_progress.connect(self.on_task_progress, queued)
+            self.task_manager.task_completed.connect(self.on_task_completed, queued)
+            self.task_manager.task_failed.connect(self.on_task_failed, queued)
 
         self.logger.info("GenerationDialog initialized")
 
@@ -105,17 +128,38 @@ class GenerationDialog(QDialog):
         self.layout.addLayout(status_layout)
 
     def setup_log_section(self):
-        """Set up the collapsible log section."""
+        """Set up the collapsible log section.
+
+        The log text area is only created the first time the section is expanded.
+        Messages logged before that are buffered and replayed on creation.
+        """
         self.log_section = CollapsibleSection("Log", self)
+        self.log_section.expanded.connect(self.on_log_expanded)
 
-        # Log text area
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMinimumHeight(150)
-        self.log_section.addWidget(self.log_text)
+        # Log text area (created lazily)
+        self._log_text = None
+        self._pending_log_messages = []
 
         self.layout.addWidget(self.log_section)
 
+    @pyqtSlot()
+    def on_log_expanded(self):
+        """Create the log text area the first time the log section is expanded."""
+        if self._log_text is not None:
+            return
+
+        self._log_text = QPlainTextEdit()
+        self._log_text.setReadOnly(True)
+        self._log_text.setMinimumHeight(150)
+        self._log_text.setMaximumBlockCount(LOG_MAX_BLOCK_COUNT)
+        self.log_section.addWidget(self._log_text)
+
+        # Replay the messages logged while the section was collapsed
+        for message in self._pending_log_messages:
+            self._log_text.appendPlainText(message)
+        self._pending_log_messages = []
+        self._scroll_log_to_bottom()
+
     def setup_button_bar(self):
         """Set up the button bar."""
         button_layout = QHBoxLayout()
@@ -158,6 +202,7 @@ class GenerationDialog(QDialog):
             voice_id=voice_id
         )
 
+    @pyqtSlot()
     def on_task_started(self):
         """Handle task start."""
         self.logger.info("Audio generation task started")
@@ -165,20 +210,45 @@ class GenerationDialog(QDialog):
         self.status_details.setText("Starting the generation process...")
         self.progress_bar.setValue(10)  # Initial progress
         self.add_log_message("Generation task started")
-        QApplication.processEvents()
 
+    @pyqtSlot(int, str)
     def on_task_progress(self, progress, message):
         """Handle task progress updates."""
-        self.logger.debug(f"Audio generation progress: {progress}%, {message}")
-        self.progress_bar.setValue(progress)
-        self.status_details.setText(message)
-        self.add_log_message(f"Progress {progress}%: {message}")
-        QApplication.processEvents()
-
+        # Keep only the latest update; the timer shows it at most every PROGRESS_UPDATE_INTERVAL ms
+        self._pending_progress = (progress, message)
+        if not self._ui_timer.isActive():
+            self._ui_timer.start()
+
+    @pyqtSlot()
+    def _flush_progress(self):
+        """Show the latest pending progress update."""
+        pending, self._pending_progress = self._pending_progress, None
+
+        # Ignore repeats of the last update
+        if pending is None or pending == self._last_progress:
+            return
+        self._last_progress = pending
+        progress, message = pending
+
+        self.logger.debug("Audio generation progress: %s%%, %s", progress, message)
+        # Apply all widget changes in a single repaint
+        self.setUpdatesEnabled(False)
+        try:
+            self.progress_bar.setValue(progress)
+            self.status_details.setText(message)
+            self.add_log_message(f"Progress {progress}%: {message}")
+        finally:
+            self.setUpdatesEnabled(True)
+
+    @pyqtSlot(dict)
     def on_task_completed(self, result):
         """Handle task completion."""
         self.logger.info(f"Audio generation completed: {result}")
 
+        # Show any pending progress first so the log stays in order
+        self._ui_timer.stop()
+        self._flush_progress()
+
         # Update UI
         self.status_label.setText("Generation completed successfully!")
         self.progress_bar.setValue(100)
@@ -195,10 +265,15 @@ class GenerationDialog(QDialog):
         # Store the result for retrieval by the parent
         self.result = result
 
+    @pyqtSlot(str)
     def on_task_failed(self, error):
         """Handle task failure."""
         self.logger.error(f"Audio generation failed: {error}")
 
+        # Show any pending progress first so the log stays in order
+        self._ui_timer.stop()
+        self._flush_progress()
+
         # Update UI
         self.status_label.setText("Generation failed!")
         self.status_details.setText(f"Error: {error}")
@@ -213,6 +288,7 @@ class GenerationDialog(QDialog):
         # Set result to None
         self.result = None
 
+    @pyqtSlot()
     def on_cancel_clicked(self):
         """Handle cancel button click."""
         self.logger.info("Cancel button clicked, showing confirmation dialog")
@@ -242,9 +318,18 @@ class GenerationDialog(QDialog):
 
     def add_log_message(self, message):
         """Add a message to the log."""
-        self.log_text.append(message)
-        # Scroll to the bottom
-        scrollbar = self.log_text.verticalScrollBar()
+        if self._log_text is None:
+            # Buffer the message until the log section is expanded
+            self._pending_log_messages.append(message)
+            del self._pending_log_messages[:-LOG_MAX_BLOCK_COUNT]
+            return
+
+        self._log_text.appendPlainText(message)
+        self._scroll_log_to_bottom()
+
+    def _scroll_log_to_bottom(self):
+        """Scroll the log text area to the bottom."""
+        scrollbar = self._log_text.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
     def get_result(self):
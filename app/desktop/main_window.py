@@ -1,17 +1,21 @@
 import logging
 
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QThreadPool, QTimer, pyqtSlot
 from PyQt6.QtGui import QAction
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QPushButton, QLabel, QMessageBox, QFrame,
     QStackedWidget, )
 
-from app.desktop.model_download_dialog import ModelDownloadDialog
-from app.desktop.routine_editor import RoutineEditorWidget
 from app.desktop.routines_list import RoutinesListWidget
-from app.desktop.settings_dialog import SettingsDialog
-from app.tts_model.tts_model import is_model_downloaded
+from app.desktop.worker import Worker
+from app.models.routine import delete_routine
+
+
+def _is_model_downloaded():
+    """Check whether the TTS model is downloaded, importing the TTS module on first use"""
+    from app.tts_model.tts_model import is_model_downloaded
+    return is_model_downloaded()
 
 
 class MainWindow(QMainWindow):
@@ -24,13 +28,13 @@ class MainWindow(QMainWindow):
         self.logger = logging.getLogger(__name__)
         self.logger.info("Initializing MainWindow")
 
+        # ID of the routine currently selected in the list
+        self.selected_routine_id = None
+
         # Set up window properties
         self.setWindowTitle("Hypno-AI")
         self.setMinimumSize(QSize(1000, 800))
 
-        # Create the menu bar
-        self.setup_menu_bar()
-
         # Create the central widget and layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -69,12 +73,11 @@ class MainWindow(QMainWindow):
         welcome_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         welcome_layout.addWidget(welcome_label)
 
-        # Create the routine editor widget
-        self.routine_editor = RoutineEditorWidget(self)
+        # The routine editor widget is created on first use
+        self._routine_editor = None
 
         # Add widgets to the stacked widget
         self.right_stacked_widget.addWidget(self.welcome_widget)
-        self.right_stacked_widget.addWidget(self.routine_editor)
 
         # Add panels to the splitter
         self.splitter.addWidget(self.left_panel)
@@ -85,17 +88,23 @@ class MainWindow(QMainWindow):
         self.routines_list.new_routine_requested.connect(self.create_new_routine)
         self.routines_list.edit_routine_requested.connect(self.edit_routine)
         self.routines_list.routine_selected.connect(self.on_routine_selected)
-        self.routine_editor.save_completed.connect(self.on_routine_saved)
-        self.routine_editor.cancel_requested.connect(self.on_edit_cancelled)
 
         # Set up status bar
         self.statusBar().showMessage("Ready")
 
-        # Check if the TTS model is downloaded and show the download dialog if needed
-        self.check_tts_model()
+        # Build the menu bar and check the TTS model once the window has been shown
+        QTimer.singleShot(0, self._post_show_init)
 
         self.logger.info("MainWindow initialized")
 
+    def _post_show_init(self):
+        """Finish the optional setup after the first event loop turn"""
+        # Create the menu bar
+        self.setup_menu_bar()
+
+        # Check if the TTS model is downloaded and show the download dialog if needed
+        self.check_tts_model()
+
     def setup_header(self):
         """Set up the header with title and action buttons"""
         header_layout = QHBoxLayout()
@@ -112,25 +121,19 @@ class MainWindow(QMainWindow):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(10)  # Consistent spacing between buttons
 
-        # Create button
-        self.create_button = QPushButton("Create")
-        self.create_button.setMinimumWidth(100)  # Consistent button width
-        self.create_button.clicked.connect(self.create_new_routine)
-        button_layout.addWidget(self.create_button)
-
-        # Delete button (initially disabled)
-        self.delete_button = QPushButton("Delete")
-        self.delete_button.setMinimumWidth(100)  # Consistent button width
-        self.delete_button.setEnabled(False)
-        self.delete_button.clicked.connect(self.delete_selected_routine)
-        button_layout.addWidget(self.delete_button)
-
-        # Regenerate button (initially disabled)
-        self.regenerate_button = QPushButton("Regenerate")
-        self.regenerate_button.setMinimumWidth(100)  # Consistent button width
-        self.regenerate_button.setEnabled(False)
-        self.regenerate_button.clicked.connect(self.regenerate_selected_routine)
-        button_layout.addWidget(self.regenerate_button)
+        # Create, Delete and Regenerate buttons (Delete/Regenerate initially disabled)
+        specs = (
+            ("Create", "create_button", True, self.create_new_routine),
+            ("Delete", "delete_button", False, self.delete_selected_routine),
+            ("Regenerate", "regenerate_button", False, self.regenerate_selected_routine),
+        )
+        for text, attr, enabled, slot in specs:
+            button = QPushButton(text)
+            button.setMinimumWidth(100)  # Consistent button width
+            button.setEnabled(enabled)
+            button.clicked.connect(slot)
+            button_layout.addWidget(button)
+            setattr(self, attr, button)
 
         # Add button layout to header
         header_layout.addLayout(button_layout)
@@ -138,34 +141,58 @@ class MainWindow(QMainWindow):
         # Add the header to the main layout
         self.main_layout.addLayout(header_layout)
 
+    def _ensure_editor(self):
+        """Get the routine editor widget, creating it on first use"""
+        if self._routine_editor is None:
+            self.logger.info("Creating routine editor widget")
+            from app.desktop.routine_editor import RoutineEditorWidget
+            editor = RoutineEditorWidget(self)
+            editor.save_completed.connect(self.on_routine_saved)
+            editor.cancel_requested.connect(self.on_edit_cancelled)
+            editor.save_status.connect(self.show_status_message)
+            self.right_stacked_widget.addWidget(editor)
+            self._routine_editor = editor
+        return self._routine_editor
+
+    @pyqtSlot()
     def create_new_routine(self):
         """Open the routine editor for creating a new routine"""
         self.logger.info("Creating new routine")
-        self.routine_editor.clear()
-        self.right_stacked_widget.setCurrentWidget(self.routine_editor)
+        editor = self._ensure_editor()
+        editor.clear()
+        self.right_stacked_widget.setCurrentWidget(editor)
 
+    @pyqtSlot(str)
     def edit_routine(self, routine_id):
         """Open the routine editor for editing an existing routine"""
         self.logger.info(f"Editing routine: {routine_id}")
-        self.routine_editor.load_routine(routine_id)
-        self.right_stacked_widget.setCurrentWidget(self.routine_editor)
+        editor = self._ensure_editor()
+        editor.load_routine(routine_id)
+        self.right_stacked_widget.setCurrentWidget(editor)
 
+    @pyqtSlot()
     def on_routine_saved(self):
         """Handle routine save completion"""
         self.logger.info("Routine saved")
         self.routines_list.refresh()
         # Keep the routine editor open after saving (don't switch to welcome widget)
         # self.right_stacked_widget.setCurrentWidget(self.welcome_widget)
-        self.statusBar().showMessage("Routine saved successfully", 3000)
 
+    @pyqtSlot(str)
+    def show_status_message(self, message):
+        """Show a transient message in the status bar"""
+        self.statusBar().showMessage(message, 3000)
+
+    @pyqtSlot()
     def on_edit_cancelled(self):
         """Handle routine edit cancellation"""
         self.logger.info("Routine edit cancelled")
         self.right_stacked_widget.setCurrentWidget(self.welcome_widget)
 
+    @pyqtSlot()
     def delete_selected_routine(self):
         """Delete the selected routine"""
-        if hasattr(self, 'selected_routine_id') and self.selected_routine_id:
+        if self.selected_routine_id:
             self.logger.info(f"Deleting routine: {self.selected_routine_id}")
 
             # Confirm deletion
@@ -178,7 +205,6 @@ class MainWindow(QMainWindow):
             )
 
             if reply == QMessageBox.StandardButton.Yes:
-                from app.models.routine import delete_routine
                 success = delete_routine(self.selected_routine_id)
                 if success:
                     self.logger.info(f"Routine deleted: {self.selected_routine_id}")
@@ -192,12 +218,14 @@ class MainWindow(QMainWindow):
                     self.logger.error(f"Failed to delete routine: {self.selected_routine_id}")
                     QMessageBox.warning(self, "Error", "Failed to delete routine.")
 
+    @pyqtSlot()
     def regenerate_selected_routine(self):
         """Regenerate the selected routine"""
-        if hasattr(self, 'selected_routine_id') and self.selected_routine_id:
+        if self.selected_routine_id:
             self.logger.info(f"Regenerating routine: {self.selected_routine_id}")
             self.edit_routine(self.selected_routine_id)
 
+    @pyqtSlot(str)
     def on_routine_selected(self, routine_id):
         """Handle routine selection"""
         self.logger.info(f"Routine selected: {routine_id}")
@@ -241,7 +269,7 @@ class MainWindow(QMainWindow):
 
         # Download TTS Model action
         download_model_action = QAction("&Download TTS Model", self)
-        download_model_action.triggered.connect(lambda: self.check_tts_model(force_show=True))
+        download_model_action.triggered.connect(self.show_model_download_dialog)
         tools_menu.addAction(download_model_action)
 
 
@@ -253,14 +281,17 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about_dialog)
         help_menu.addAction(about_action)
 
+    @pyqtSlot()
     def show_settings_dialog(self):
         """Show the settings dialog"""
         self.logger.info("Showing settings dialog")
+        from app.desktop.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self)
         dialog.settings_changed.connect(self.on_settings_changed)
         dialog.exec()
 
 
+    @pyqtSlot()
     def show_about_dialog(self):
         """Show the about dialog"""
         self.logger.info("Showing about dialog")
@@ -272,6 +303,7 @@ class MainWindow(QMainWindow):
             "Version 1.0.0"
         )
 
+    @pyqtSlot()
     def on_settings_changed(self):
         """Handle settings changed signal"""
         self.logger.info("Settings changed")
@@ -286,13 +318,37 @@ class MainWindow(QMainWindow):
         """
         self.logger.info("Checking if TTS model is downloaded")
 
-        if not is_model_downloaded() or force_show:
-            self.logger.info("TTS model not downloaded or force_show=True, showing download dialog")
-            dialog = ModelDownloadDialog(self)
-            dialog.exec()
+        # The user asked for the dialog, so there is nothing to check first
+        if force_show:
+            self.logger.info("force_show=True, showing download dialog")
+            self.show_model_download_dialog()
+            return
+
+        # Check the model files on a pool thread so the window can paint first
+        worker = Worker(_is_model_downloaded)
+        worker.signals.finished.connect(self.on_model_check_done)
+        worker.signals.error.connect(lambda error: self.logger.error(f"Error checking TTS model: {error}"))
+        QThreadPool.globalInstance().start(worker)
+
+    @pyqtSlot(object)
+    def on_model_check_done(self, downloaded):
+        """Handle the result of the background TTS model check"""
+        if not downloaded:
+            self.logger.info("TTS model not downloaded, showing download dialog")
+            self.show_model_download_dialog()
         else:
             self.logger.info("TTS model is already downloaded")
 
+    @pyqtSlot()
+    def show_model_download_dialog(self):
+        """Show the TTS model download dialog"""
+        from app.desktop.model_download_dialog import ModelDownloadDialog
+        from app.tts_model.tts_model import invalidate_model_cache
+        dialog = ModelDownloadDialog(self)
+        dialog.exec()
+        # The dialog may have downloaded the model, so re-check the files next time
+        invalidate_model_cache()
+
     def closeEvent(self, event):
         """Handle window close event"""
         self.logger.info("Application closing")
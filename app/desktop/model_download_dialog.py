@@ -1,14 +1,30 @@
 import logging
 
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QObject, QThreadPool, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QProgressBar, QDialogButtonBox, QMessageBox
 )
 
+from app.desktop.worker import Worker
+from app.tts_model.downloader import prime_connection
 from app.tts_model.tts_model import get_model_status, start_model_download, is_model_downloaded, get_model_dir
 
 
+# Bytes per megabyte, the unit of the download progress bar
+BYTES_PER_MB = 1024 * 1024
+
+# Interval in milliseconds for checking a download that does not report to the dialog
+STATUS_POLL_INTERVAL = 1000
+
+
+class DownloadSignals(QObject):
+    """Signals used to report the model download from the download thread"""
+
+    progress = pyqtSignal('qint64', 'qint64')  # bytes downloaded, total bytes
+    finished = pyqtSignal()
+
+
 class ModelDownloadDialog(QDialog):
     """Dialog for downloading the TTS model"""
 
@@ -78,10 +94,10 @@ class ModelDownloadDialog(QDialog):
         self.button_box.button(QDialogButtonBox.StandardButton.Close).setEnabled(False)
         self.layout.addWidget(self.button_box)
 
-        # Set up a timer to check the download status
-        from PyQt6.QtCore import QTimer
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.check_download_status)
+        # Signals emitted by the download thread (delivered to this thread as queued calls)
+        self.download_signals = DownloadSignals()
+        self.download_signals.progress.connect(self.on_download_progress)
+        self.download_signals.finished.connect(self.on_download_finished)
 
         # Check if the model is already downloaded
         self.check_initial_status()
@@ -90,7 +106,13 @@ class ModelDownloadDialog(QDialog):
 
     def check_initial_status(self):
         """Check if the model is already downloaded"""
-        if is_model_downloaded():
+        if get_model_status()['status'] == 'downloading':
+            # A download is already running, so follow its status until it finishes
+            self.set_downloading_state()
+            self.progress_bar.setMaximum(0)  # No byte counts available, show a busy indicator
+            self.status_label.setText("Downloading model... This may take a few minutes.")
+            QTimer.singleShot(STATUS_POLL_INTERVAL, self.check_download_status)
+        elif is_model_downloaded():
             self.status_label.setText("Model is already downloaded.")
             self.download_button.setText("Re-download Model")
             self.button_box.button(QDialogButtonBox.StandardButton.Close).setEnabled(True)
@@ -104,16 +126,17 @@ class ModelDownloadDialog(QDialog):
         else:
             self.status_label.setText("Model is not downloaded.")
 
-    def start_download(self):
-        """Start downloading the model"""
-        self.logger.info("Starting model download")
+            # Open the connection to the model host now so the download starts without a handshake
+            QThreadPool.globalInstance().start(Worker(prime_connection))
 
-        # Update UI
+    def set_downloading_state(self):
+        """Update the UI for a running download"""
         self.download_button.setEnabled(False)
         self.skip_button.setEnabled(False)
         self.progress_bar.setVisible(True)
+        self.progress_bar.setFormat("%p%")
+        self.progress_bar.setMaximum(100)
         self.progress_bar.setValue(0)
-        self.status_label.setText("Starting download...")
 
         # Reset the info label to the downloading state
         self.info_label.setText(
@@ -121,28 +144,67 @@ class ModelDownloadDialog(QDialog):
             "Please wait while the model is being downloaded."
         )
 
-        # Start the download
-        start_model_download()
+    @pyqtSlot()
+    def start_download(self):
+        """Start downloading the model"""
+        self.logger.info("Starting model download")
 
-        # Start the timer to check the download status
-        self.timer.start(1000)  # Check every second
+        # Update UI
+        self.set_downloading_state()
+        self.status_label.setText("Starting download...")
+
+        # Start the download, reporting progress and completion through signals
+        started = start_model_download(
+            progress_callback=self.download_signals.progress.emit,
+            completion_callback=self.download_signals.finished.emit
+        )
+        if started:
+            self.status_label.setText("Downloading model... This may take a few minutes.")
+        else:
+            # Another download is running, follow its status instead
+            QTimer.singleShot(STATUS_POLL_INTERVAL, self.check_download_status)
+
+    @pyqtSlot('qint64', 'qint64')
+    def on_download_progress(self, bytes_done, bytes_total):
+        """Update the progress bar from the downloaded byte count"""
+        # Count in megabytes so multi-GB models fit in the progress bar's int range
+        total_mb = max(bytes_total // BYTES_PER_MB, 1)
+        done_mb = min(bytes_done // BYTES_PER_MB, total_mb)
+
+        # Skip updates that would not change the bar
+        if self.progress_bar.maximum() == total_mb and self.progress_bar.value() == done_mb:
+            return
+
+        # Apply the range and value changes in a single repaint
+        self.progress_bar.setUpdatesEnabled(False)
+        try:
+            if self.progress_bar.maximum() != total_mb:
+                self.progress_bar.setMaximum(total_mb)
+                self.progress_bar.setFormat("%p%  (%v / %m MB)")
+            self.progress_bar.setValue(done_mb)
+        finally:
+            self.progress_bar.setUpdatesEnabled(True)
 
     def check_download_status(self):
-        """Check the status of the model download"""
-        status = get_model_status()
+        """Check the status of a download that is not reporting to this dialog"""
+        if get_model_status()['status'] == 'downloading':
+            # Check again later; re-arming here means checks can never overlap
+            QTimer.singleShot(STATUS_POLL_INTERVAL, self.check_download_status)
+        else:
+            self.on_download_finished()
 
-        if status['status'] == 'downloading':
-            # Update progress (since we don't have actual progress, use a simple animation)
-            current_value = self.progress_bar.value()
-            if current_value < 95:  # Don't go to 100% until it's actually done
-                self.progress_bar.setValue(current_value + 1)
-            self.status_label.setText("Downloading model... This may take a few minutes.")
+    @pyqtSlot()
+    def on_download_finished(self):
+        """Handle the end of the model download"""
+        status = get_model_status()
+        if self.progress_bar.maximum() == 0:
+            # Leave the busy indicator state of a download followed by polling
+            self.progress_bar.setMaximum(100)
 
-        elif status['status'] == 'downloaded':
+        if status['status'] == 'downloaded':
             # Download complete
-            self.progress_bar.setValue(100)
+            self.progress_bar.setValue(self.progress_bar.maximum())
             self.status_label.setText("Model downloaded successfully!")
-            self.timer.stop()
             self.button_box.button(QDialogButtonBox.StandardButton.Close).setEnabled(True)
             self.download_complete.emit()
 
@@ -152,8 +214,8 @@ class ModelDownloadDialog(QDialog):
             self.status_label.setText(f"Download failed: {status['error']}")
             self.download_button.setEnabled(True)
             self.skip_button.setEnabled(True)
-            self.timer.stop()
 
+    @pyqtSlot()
     def skip_download(self):
         """Skip the model download (not recommended)"""
         self.logger.warning("User chose to skip model download")
@@ -4,10 +4,12 @@ This module provides a TaskManager class that uses PyQt signals for task progres
 """
 
 import logging
+import threading
 from typing import Any, Dict
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QThreadPool, QTimer, pyqtSignal
 
+from app.desktop.worker import Worker
 from app.tasks.base_task_manager import BaseTaskManager, TaskProgressNotifier
 
 
@@ -23,12 +25,29 @@ class QtTaskProgressNotifier(QObject):
     task_progress = pyqtSignal(int, str)  # progress percentage, message
     task_completed = pyqtSignal(dict)  # result dictionary
     task_failed = pyqtSignal(str)  # error message
+
+    # Internal signal used to start the flush timer from the task thread
+    _progress_pending = pyqtSignal()
+
+    # Interval in milliseconds at which progress updates are delivered (about one per frame)
+    PROGRESS_INTERVAL = 16
     
     def __init__(self):
         """Initialize the notifier"""
         QObject.__init__(self)
         self.logger = logging.getLogger(__name__)
         self.logger.debug("Initializing QtTaskProgressNotifier")
+
+        # Latest (percent, message) pair that has not been emitted yet
+        self._pending = None
+        self._pending_lock = threading.Lock()
+
+        # Timer that emits the latest progress once per interval
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(self.PROGRESS_INTERVAL)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_progress)
+        self._progress_pending.connect(self._flush_timer.start)
     
     def notify_started(self, task_id: str) -> None:
         """
@@ -37,7 +56,7 @@ class QtTaskProgressNotifier(QObject):
         Args:
             task_id: ID of the task
         """
-        self.logger.debug(f"Task {task_id} started")
+        self.logger.debug("Task %s started", task_id)
         self.task_started.emit()
     
     def notify_progress(self, task_id: str, percent: int, message: str) -> None:
@@ -49,8 +68,19 @@ class QtTaskProgressNotifier(QObject):
             percent: Progress percentage (0-100)
             message: Progress message
         """
-        self.logger.debug(f"Task {task_id} progress: {percent}% - {message}")
-        self.task_progress.emit(percent, message)
+        # Only keep the latest update; the timer delivers it at the end of the interval
+        with self._pending_lock:
+            first = self._pending is None
+            self._pending = (percent, message)
+        if first:
+            self._progress_pending.emit()
+
+    def _flush_progress(self) -> None:
+        """Emit the latest pending progress update, if any"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self.task_progress.emit(*pending)
     
     def notify_completed(self, task_id: str, result: Dict[str, Any]) -> None:
         """
@@ -60,7 +90,8 @@ class QtTaskProgressNotifier(QObject):
             task_id: ID of the task
             result: Result data
         """
-        self.logger.debug(f"Task {task_id} completed with result: {result}")
+        self.logger.debug("Task %s completed with result: %s", task_id, result)
+        self._flush_progress()
         self.task_completed.emit(result)
     
     def notify_failed(self, task_id: str, error: str) -> None:
@@ -71,7 +102,8 @@ class QtTaskProgressNotifier(QObject):
             task_id: ID of the task
             error: Error message
         """
-        self.logger.debug(f"Task {task_id} failed with error: {error}")
+        self.logger.debug("Task %s failed with error: %s", task_id, error)
+        self._flush_progress()
         self.task_failed.emit(error)
 
 
@@ -88,22 +120,48 @@ class TaskManager(BaseTaskManager):
         
         # Initialize the base class
         super().__init__(self.notifier)
+
+        # Run tasks on a single pool thread that is kept alive between tasks
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self.thread_pool.setExpiryTimeout(-1)
+        self._running = False
+        
+        # Expose the signals from the notifier
+        self.task_started = self.notifier.task_started
+        self.task_progress = self.notifier.task_progress
+        self.task_completed = self.notifier.task_completed
+        self.task_failed = self.notifier.task_failed
         
         self.logger.info("Qt TaskManager initialized")
+
+    def is_task_running(self) -> bool:
+        """
+        Check if a task is currently running.
+        
+        Returns:
+            bool: True if a task is running, False otherwise
+        """
+        return self._running
     
-    # Expose the signals from the notifier
-    @property
-    def task_started(self):
-        return self.notifier.task_started
-    
-    @property
-    def task_progress(self):
-        return self.notifier.task_progress
-    
-    @property
-    def task_completed(self):
-        return self.notifier.task_completed
+    def _start_worker(self, *args: Any) -> Worker:
+        """
+        Run _run_task on the task thread pool.
+        
+        Args:
+            *args: Arguments for _run_task
+            
+        Returns:
+            Worker: The submitted runnable, kept as the current task
+        """
+        self._running = True
+        worker = Worker(self._run_pooled_task, *args)
+        self.thread_pool.start(worker)
+        return worker
     
-    @property
-    def task_failed(self):
-        return self.notifier.task_failed
\ No newline at end of file
+    def _run_pooled_task(self, *args: Any) -> None:
+        """Run the task and clear the running flag once it has finished"""
+        try:
+            self._run_task(*args)
+        finally:
+            self._running = False
@@ -1,21 +1,52 @@
 import logging
 import os
+import shutil
 import uuid
 
-from PyQt6.QtCore import pyqtSignal, QUrl
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QBuffer, QIODevice, QThreadPool, QUrl
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
     QLineEdit, QTextEdit, QComboBox, QRadioButton, QFileDialog,
-    QMessageBox, QProgressBar, QGroupBox, QFormLayout, QButtonGroup,
-    QApplication
+    QMessageBox, QProgressBar, QGroupBox, QFormLayout, QButtonGroup
 )
 
-from app.config import LANGUAGES, SAMPLE_VOICES, OUTPUT_FOLDER, USER_VOICES_FOLDER
+from app.config import LANGUAGES, SAMPLE_VOICES, OUTPUT_FOLDER, USER_VOICES_FOLDER, ALLOWED_EXTENSIONS
 from app.desktop.generation_dialog import GenerationDialog
 from app.desktop.qt_task_manager import TaskManager
-from app.models.routine import get_routine
-from app.utils import allowed_file
+from app.desktop.worker import Worker
+from app.models.routine import add_routine, update_routine, get_routine
+
+# Combo box entries, computed once at import
+_LANG_CODES = list(LANGUAGES.keys())
+_LANG_NAMES = list(LANGUAGES.values())
+_VOICE_IDS = list(SAMPLE_VOICES.keys())
+_VOICE_NAMES = [voice['name'] for voice in SAMPLE_VOICES.values()]
+
+# Combo box index of each language code and sample voice ID
+_LANG_INDEX = {code: i for i, code in enumerate(_LANG_CODES)}
+_VOICE_INDEX = {voice_id: i for i, voice_id in enumerate(_VOICE_IDS)}
+
+# Voice file dialog filter, so only supported audio files can be picked
+_VOICE_FILE_FILTER = f"Audio Files ({' '.join(f'*.{ext}' for ext in sorted(ALLOWED_EXTENSIONS))})"
+
+
+def _copy_audio_file(source_path, dest_path):
+    """Copy an audio file with its metadata and return the destination path"""
+    # copyfile uses the kernel's zero-copy path (e.g. sendfile) where available
+    shutil.copyfile(source_path, dest_path)
+    shutil.copystat(source_path, dest_path)
+    return dest_path
+
+
+def _read_audio_file(file_path):
+    """Read an audio file into memory and return its path and contents (None if unreadable)"""
+    try:
+        with open(file_path, 'rb') as f:
+            return file_path, f.read()
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Could not preload audio file {file_path}: {str(e)}")
+        return file_path, None
 
 
 class RoutineEditorWidget(QWidget):
@@ -24,6 +55,7 @@ class RoutineEditorWidget(QWidget):
     # Define signals
     save_completed = pyqtSignal()
     cancel_requested = pyqtSignal()
+    save_status = pyqtSignal(str)  # transient status message
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -53,8 +85,11 @@ class RoutineEditorWidget(QWidget):
         # Create the result section
         self.setup_result_section()
 
-        # Task manager signals are now handled by the GenerationDialog
-        # No need to connect them here
+        # Task manager signals are now handled by the GenerationDialog; the editor only
+        # needs to drop its cancel confirmation once the task has ended
+        queued = Qt.ConnectionType.QueuedConnection
+        self.task_manager.task_completed.connect(self.hide_cancel_confirm, queued)
+        self.task_manager.task_failed.connect(self.hide_cancel_confirm, queued)
 
         self.logger.info("RoutineEditorWidget initialized")
 
@@ -81,8 +116,9 @@ class RoutineEditorWidget(QWidget):
 
         # Language
         self.language_combo = QComboBox()
-        for code, name in LANGUAGES.items():
-            self.language_combo.addItem(name, code)
+        self.language_combo.addItems(_LANG_NAMES)
+        for i, code in enumerate(_LANG_CODES):
+            self.language_combo.setItemData(i, code)
         form_layout.addRow("Language:", self.language_combo)
 
         # Voice Selection
@@ -99,8 +135,9 @@ class RoutineEditorWidget(QWidget):
 
         # Sample voice selector
         self.sample_voice_combo = QComboBox()
-        for voice_id, voice in SAMPLE_VOICES.items():
-            self.sample_voice_combo.addItem(voice['name'], voice_id)
+        self.sample_voice_combo.addItems(_VOICE_NAMES)
+        for i, voice_id in enumerate(_VOICE_IDS):
+            self.sample_voice_combo.setItemData(i, voice_id)
         voice_layout.addWidget(self.sample_voice_combo)
 
         # Upload voice option
@@ -177,8 +214,26 @@ class RoutineEditorWidget(QWidget):
         self.status_details.setStyleSheet("color: gray; font-style: italic;")
         status_layout.addWidget(self.status_details)
 
+        # Inline cancel confirmation, so task progress keeps updating while the user decides
+        self.cancel_confirm_bar = QWidget()
+        confirm_layout = QHBoxLayout(self.cancel_confirm_bar)
+        confirm_layout.setContentsMargins(0, 0, 0, 0)
+        confirm_layout.addWidget(QLabel("A generation task is in progress. Cancel the generation?"))
+        confirm_layout.addStretch()
+
+        confirm_yes_button = QPushButton("Yes")
+        confirm_yes_button.clicked.connect(self.on_cancel_confirmed)
+        confirm_layout.addWidget(confirm_yes_button)
+
+        confirm_no_button = QPushButton("No")
+        confirm_no_button.clicked.connect(self.cancel_confirm_bar.hide)
+        confirm_layout.addWidget(confirm_no_button)
+
+        self.cancel_confirm_bar.setVisible(False)
+
         self.status_group.setLayout(status_layout)
         self.layout.addWidget(self.status_group)
+        self.layout.addWidget(self.cancel_confirm_bar)
 
     def setup_result_section(self):
         """Set up the result section for displaying the generated audio"""
@@ -190,10 +245,13 @@ class RoutineEditorWidget(QWidget):
         success_label = QLabel("Your hypnosis audio is ready! You can listen to it below or save it to your device.")
         result_layout.addWidget(success_label)
 
-        # Media player
-        self.audio_output = QAudioOutput()
-        self.player = QMediaPlayer()
-        self.player.setAudioOutput(self.audio_output)
+        # Media player (created on first use)
+        self.audio_output = None
+        self.player = None
+
+        # In-memory copy of the audio the player reads from, and the file it holds
+        self._audio_buffer = None
+        self._audio_path = None
 
         # Audio controls
         audio_layout = QHBoxLayout()
@@ -215,6 +273,23 @@ class RoutineEditorWidget(QWidget):
         self.result_group.setLayout(result_layout)
         self.layout.addWidget(self.result_group)
 
+    def _ensure_player(self):
+        """Get the media player, creating it and its audio output on first use"""
+        if self.player is None:
+            self.audio_output = QAudioOutput()
+            self.player = QMediaPlayer()
+            self.player.setAudioOutput(self.audio_output)
+            self.player.mediaStatusChanged.connect(self.on_media_status_changed)
+        return self.player
+
+    @pyqtSlot(QMediaPlayer.MediaStatus)
+    def on_media_status_changed(self, status):
+        """Enable the Play button once the media player has loaded the audio"""
+        if status in (QMediaPlayer.MediaStatus.LoadedMedia, QMediaPlayer.MediaStatus.BufferedMedia):
+            self.play_button.setEnabled(True)
+        elif status == QMediaPlayer.MediaStatus.InvalidMedia:
+            self.logger.warning(f"Media player could not load the audio: {self.player.errorString()}")
+
     def clear(self):
         """Clear all form fields"""
         self.routine_id = None
@@ -229,6 +304,7 @@ class RoutineEditorWidget(QWidget):
         self.voice_file_path.clear()
 
         self.status_group.setVisible(False)
+        self.cancel_confirm_bar.setVisible(False)
         self.result_group.setVisible(False)
 
         self.generate_button.setEnabled(True)
@@ -253,21 +329,17 @@ class RoutineEditorWidget(QWidget):
         self.text_input.setText(routine.get('text', ''))
 
         # Set language
-        language_code = routine.get('language', 'en')
-        for i in range(self.language_combo.count()):
-            if self.language_combo.itemData(i) == language_code:
-                self.language_combo.setCurrentIndex(i)
-                break
+        language_index = _LANG_INDEX.get(routine.get('language', 'en'))
+        if language_index is not None:
+            self.language_combo.setCurrentIndex(language_index)
 
         # Set voice type and selection
         voice_type = routine.get('voice_type', 'sample')
         if voice_type == 'sample':
             self.sample_voice_radio.setChecked(True)
-            voice_id = routine.get('voice_id', '')
-            for i in range(self.sample_voice_combo.count()):
-                if self.sample_voice_combo.itemData(i) == voice_id:
-                    self.sample_voice_combo.setCurrentIndex(i)
-                    break
+            voice_index = _VOICE_INDEX.get(routine.get('voice_id', ''))
+            if voice_index is not None:
+                self.sample_voice_combo.setCurrentIndex(voice_index)
         else:
             self.upload_voice_radio.setChecked(True)
             # Can't restore the uploaded file, user will need to re-upload
@@ -278,37 +350,29 @@ class RoutineEditorWidget(QWidget):
 
         self.logger.info(f"Routine loaded: {routine_id}")
 
+    @pyqtSlot(bool)
     def on_voice_type_changed(self, checked):
         """Handle voice type radio button changes"""
         self.sample_voice_combo.setEnabled(self.sample_voice_radio.isChecked())
         self.voice_file_path.setEnabled(self.upload_voice_radio.isChecked())
         self.browse_button.setEnabled(self.upload_voice_radio.isChecked())
 
+    @pyqtSlot()
     def on_browse_clicked(self):
         """Handle click on the Browse button for voice file selection"""
         self.logger.info("Browse button clicked for voice file selection")
 
-        file_dialog = QFileDialog()
-        file_dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
-        file_dialog.setNameFilter("Audio Files (*.wav *.mp3 *.ogg)")
-        # Set the default directory to the user voices folder
-        file_dialog.setDirectory(USER_VOICES_FOLDER)
-
-        if file_dialog.exec():
-            file_paths = file_dialog.selectedFiles()
-            if file_paths:
-                file_path = file_paths[0]
-                self.logger.info(f"Selected voice file: {file_path}")
-
-                # Validate file extension
-                if not allowed_file(file_path):
-                    self.logger.warning(f"Invalid file type: {file_path}")
-                    QMessageBox.warning(self, "Error", "Invalid file type. Please select a WAV, MP3, or OGG file.")
-                    return
+        # Use the static helper so the platform's native dialog is shown, filtering by file type
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Voice File", USER_VOICES_FOLDER, _VOICE_FILE_FILTER
+        )
 
-                self.voice_path = file_path
-                self.voice_file_path.setText(os.path.basename(file_path))
+        if file_path:
+            self.logger.info(f"Selected voice file: {file_path}")
+            self.voice_path = file_path
+            self.voice_file_path.setText(os.path.basename(file_path))
 
+    @pyqtSlot()
     def on_generate_clicked(self):
         """Handle click on the Generate button"""
         self.logger.info("Generate button clicked")
@@ -366,23 +430,25 @@ class RoutineEditorWidget(QWidget):
         if result == True and dialog.get_result():
             self.on_generation_completed(dialog.get_result())
         else:
+            self.hide_cancel_confirm()
             self.logger.info("Generation cancelled or failed")
 
+    @pyqtSlot()
     def on_task_started(self):
         """Handle task start (legacy method, generation now handled by dialog)"""
         self.logger.info("Audio generation task started")
         self.status_label.setText("Generating your hypnosis audio... This may take a few minutes.")
         self.status_details.setText("Starting the generation process...")
         self.progress_bar.setValue(10)  # Initial progress
-        QApplication.processEvents()
 
+    @pyqtSlot(int, str)
     def on_task_progress(self, progress, message):
         """Handle task progress updates (legacy method, generation now handled by dialog)"""
-        self.logger.debug(f"Audio generation progress: {progress}%, {message}")
+        self.logger.debug("Audio generation progress: %s%%, %s", progress, message)
         self.progress_bar.setValue(progress)
         self.status_details.setText(message)
-        QApplication.processEvents()
 
+    @pyqtSlot(dict)
     def on_task_completed(self, result):
         """Handle task completion (legacy method, generation now handled by dialog)"""
         self.logger.info(f"Audio generation completed: {result}")
@@ -391,11 +457,13 @@ class RoutineEditorWidget(QWidget):
         self.routine_id = result.get('routine_id')
         self.output_filename = result.get('filename')
 
-        # Show the result section
+        # Show the result section, reloading the audio as it may have been regenerated under the same name
+        self._audio_path = None
         self.show_result()
 
         # Hide the status section
         self.status_group.setVisible(False)
+        self.hide_cancel_confirm()
 
         # Re-enable the generate button
         self.generate_button.setEnabled(True)
@@ -410,18 +478,22 @@ class RoutineEditorWidget(QWidget):
         self.routine_id = result.get('routine_id')
         self.output_filename = result.get('filename')
 
-        # Show the result section
+        # Show the result section, reloading the audio as it may have been regenerated under the same name
+        self._audio_path = None
         self.show_result()
 
         # Hide the status section if it's visible
         self.status_group.setVisible(False)
+        self.hide_cancel_confirm()
 
+    @pyqtSlot(str)
     def on_task_failed(self, error):
         """Handle task failure (legacy method, generation now handled by dialog)"""
         self.logger.error(f"Audio generation failed: {error}")
 
         # Hide the status section
         self.status_group.setVisible(False)
+        self.hide_cancel_confirm()
 
         # Show error message
         QMessageBox.critical(self, "Error", f"Failed to generate audio: {error}")
@@ -437,23 +509,60 @@ class RoutineEditorWidget(QWidget):
         # Set up the media player
         file_path = os.path.join(OUTPUT_FOLDER, self.output_filename)
         if os.path.exists(file_path):
-            self.player.setSource(QUrl.fromLocalFile(file_path))
+            player = self._ensure_player()
+            if self._audio_path == file_path:
+                # Already loaded, nothing to wait for
+                self.on_media_status_changed(player.mediaStatus())
+            else:
+                # Read the audio into memory on a pool thread and enable Play once the player has loaded it
+                self.play_button.setEnabled(False)
+                self._audio_path = file_path
+                worker = Worker(_read_audio_file, file_path)
+                worker.signals.finished.connect(self.on_audio_read)
+                QThreadPool.globalInstance().start(worker)
             self.result_group.setVisible(True)
             self.logger.info(f"Audio file loaded: {file_path}")
         else:
             self.logger.warning(f"Audio file not found: {file_path}")
             QMessageBox.warning(self, "Error", f"Audio file not found: {self.output_filename}")
 
+    @pyqtSlot(object)
+    def on_audio_read(self, result):
+        """Hand the audio read into memory to the media player"""
+        file_path, data = result
+        if file_path != self._audio_path:
+            # Another audio file was shown in the meantime
+            return
+
+        if data is None:
+            # Let the media player read the file itself
+            self._ensure_player().setSource(QUrl.fromLocalFile(file_path))
+            return
+
+        # Play from a buffer so the first play does not wait for the disk
+        old_buffer = self._audio_buffer
+        self._audio_buffer = QBuffer(self)
+        self._audio_buffer.setData(data)
+        self._audio_buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        self._ensure_player().setSourceDevice(self._audio_buffer, QUrl.fromLocalFile(file_path))
+        if old_buffer is not None:
+            old_buffer.close()
+            old_buffer.deleteLater()
+
+    @pyqtSlot()
     def on_play_clicked(self):
         """Handle click on the Play button"""
         self.logger.info("Play button clicked")
-        self.player.play()
+        self._ensure_player().play()
 
+    @pyqtSlot()
     def on_stop_clicked(self):
         """Handle click on the Stop button"""
         self.logger.info("Stop button clicked")
-        self.player.stop()
+        if self.player is not None:
+            self.player.stop()
 
+    @pyqtSlot()
     def on_save_routine_clicked(self):
         """Handle click on the Save button (saves routine without generating audio)"""
         self.logger.info("Save routine button clicked")
@@ -484,8 +593,6 @@ class RoutineEditorWidget(QWidget):
 
         # Save the routine to the database
         try:
-            from app.models.routine import add_routine, update_routine, get_routine
-
             if self.routine_id and get_routine(self.routine_id):
                 # Update existing routine
                 self.logger.info(f"Updating existing routine {self.routine_id}")
@@ -511,8 +618,8 @@ class RoutineEditorWidget(QWidget):
                 self.routine_id = routine['id']
                 self.logger.info(f"New routine created with ID {routine['id']}")
 
-            # Show success message
-            QMessageBox.information(self, "Success", "Routine saved successfully.")
+            # Report success without blocking on a modal dialog
+            self.save_status.emit("Routine saved successfully")
 
             # Emit the save_completed signal to update the UI
             self.save_completed.emit()
@@ -521,6 +628,7 @@ class RoutineEditorWidget(QWidget):
             self.logger.error(f"Error saving routine: {str(e)}")
             QMessageBox.critical(self, "Error", f"Failed to save routine: {str(e)}")
 
+    @pyqtSlot()
     def on_save_clicked(self):
         """Handle click on the Save Audio button"""
         self.logger.info("Save Audio button clicked")
@@ -536,52 +644,65 @@ class RoutineEditorWidget(QWidget):
             return
 
         # Open file dialog to select destination
-        file_dialog = QFileDialog()
-        file_dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
-        file_dialog.setDefaultSuffix("wav")
-        file_dialog.setNameFilter("WAV Files (*.wav)")
-
         suggested_name = self.name_input.text().strip()
         if not suggested_name:
             suggested_name = "hypnosis_routine"
 
-        file_dialog.selectFile(f"{suggested_name}.wav")
-
-        if file_dialog.exec():
-            file_paths = file_dialog.selectedFiles()
-            if file_paths:
-                dest_path = file_paths[0]
-                self.logger.info(f"Saving audio to: {dest_path}")
-
-                try:
-                    # Copy the file
-                    import shutil
-                    shutil.copy2(source_path, dest_path)
-                    self.logger.info(f"Audio saved to: {dest_path}")
-                    QMessageBox.information(self, "Success", f"Audio saved to: {dest_path}")
-                except Exception as e:
-                    self.logger.error(f"Error saving audio: {str(e)}")
-                    QMessageBox.critical(self, "Error", f"Failed to save audio: {str(e)}")
+        dest_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Audio", f"{suggested_name}.wav", "WAV Files (*.wav)"
+        )
 
+        if dest_path:
+            # Not every native dialog appends the extension
+            if not os.path.splitext(dest_path)[1]:
+                dest_path += ".wav"
+            self.logger.info(f"Saving audio to: {dest_path}")
+
+            # Copy the file on a pool thread, disabling the button until it is done
+            self.save_audio_button.setEnabled(False)
+            worker = Worker(_copy_audio_file, source_path, dest_path)
+            worker.signals.finished.connect(self.on_audio_saved)
+            worker.signals.error.connect(self.on_audio_save_failed)
+            QThreadPool.globalInstance().start(worker)
+
+    @pyqtSlot(object)
+    def on_audio_saved(self, dest_path):
+        """Handle completion of the audio file copy"""
+        self.save_audio_button.setEnabled(True)
+        self.logger.info(f"Audio saved to: {dest_path}")
+        QMessageBox.information(self, "Success", f"Audio saved to: {dest_path}")
+
+    @pyqtSlot(str)
+    def on_audio_save_failed(self, error):
+        """Handle failure of the audio file copy"""
+        self.save_audio_button.setEnabled(True)
+        self.logger.error(f"Error saving audio: {error}")
+        QMessageBox.critical(self, "Error", f"Failed to save audio: {error}")
+
+    @pyqtSlot()
     def on_cancel_clicked(self):
         """Handle click on the Cancel button"""
         self.logger.info("Cancel button clicked")
 
-        # If a task is running, confirm cancellation
+        # If a task is running, ask for confirmation without blocking the event loop
         if self.task_manager.is_task_running():
-            reply = QMessageBox.question(
-                self, 
-                "Confirm Cancellation",
-                "A generation task is in progress. Are you sure you want to cancel?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.No
-            )
-
-            if reply == QMessageBox.StandardButton.Yes:
-                self.task_manager.cancel_task()
-                self.cancel_requested.emit()
-
+            self.cancel_confirm_bar.setVisible(True)
             return
 
         # Otherwise, just emit the cancel signal
         self.cancel_requested.emit()
+
+    @pyqtSlot()
+    def on_cancel_confirmed(self):
+        """Cancel the running task after confirmation in the status section"""
+        self.logger.info("Cancellation confirmed")
+        self.cancel_confirm_bar.setVisible(False)
+        # The task may have ended while the confirmation was shown
+        if self.task_manager.is_task_running():
+            self.task_manager.cancel_task()
+        self.cancel_requested.emit()
+
+    @pyqtSlot()
+    def hide_cancel_confirm(self):
+        """Hide the cancel confirmation, e.g. once the task it refers to has ended"""
+        self.cancel_confirm_bar.setVisible(False)
@@ -1,14 +1,172 @@
 import logging
-import os
 
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThreadPool, QTimer, pyqtSignal, pyqtSlot
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
-    QAbstractItemView
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView
 )
 
-from app.config import LANGUAGES, OUTPUT_FOLDER
-from app.models.routine import list_routines, delete_routine, get_routine
+from app.desktop.worker import Worker
+from app.models.routine import list_routine_rows, routines_version
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class RoutinesModel(QAbstractTableModel):
+    """Table model of the routines list, storing each column as its own list"""
+
+    HEADERS = ("Name", "Language", "Created")
+
+    # Texts shown in a single spanning row instead of routines
+    EMPTY_TEXT = "No saved routines yet. Click 'Create New Routine' to get started."
+    LOADING_TEXT = "Loading routines..."
+
+    # Number of rows handed to the view at a time as it scrolls
+    FETCH_BATCH = 100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Column stores, one entry per row
+        self._ids = []
+        self._names = []
+        self._langs = []
+        self._dates = []
+        self._columns = (self._names, self._langs, self._dates)
+
+        # Number of leading rows the view has fetched so far
+        self._fetched = 0
+
+        # Text of the placeholder row shown instead of routines, None if routines are shown
+        self.placeholder = None
+
+    def rowCount(self, parent=QModelIndex()):
+        """Number of routines, or one for the placeholder row"""
+        if parent.isValid():
+            return 0
+        return 1 if self.placeholder is not None else self._fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        """Number of columns"""
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Cell text, or the placeholder message"""
+        if self.placeholder is not None:
+            if index.column() == 0:
+                if role == Qt.ItemDataRole.DisplayRole:
+                    return self.placeholder
+                if role == Qt.ItemDataRole.TextAlignmentRole:
+                    return Qt.AlignmentFlag.AlignCenter
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._columns[index.column()][index.row()]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Whether there are routines the view has not fetched yet"""
+        return not parent.isValid() and self.placeholder is None and self._fetched < len(self._ids)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Hand the next batch of routines to the view"""
+        count = min(self.FETCH_BATCH, len(self._ids) - self._fetched)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """Column titles"""
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def routine_id(self, row):
+        """Get the routine ID of a row, or None for the placeholder or an invalid row"""
+        if self.placeholder is not None or not 0 <= row < self._fetched:
+            return None
+        return self._ids[row]
+
+    def row_of(self, routine_id):
+        """Get the fetched row of a routine, or -1 if it is not shown"""
+        try:
+            row = self._ids.index(routine_id)
+        except ValueError:
+            return -1
+        return row if row < self._fetched else -1
+
+    def set_rows(self, routine_rows):
+        """
+        Replace the routines, only signalling the rows and cells that changed.
+
+        Args:
+            routine_rows: RoutineRow list in display order
+        """
+        rows = {row.id: (row.name, row.language_name, row.created_date) for row in routine_rows}
+
+        # Switching to or from the placeholder changes the whole layout
+        if not rows or self.placeholder is not None:
+            self.beginResetModel()
+            self._ids[:] = rows.keys()
+            for column, store in enumerate(self._columns):
+                store[:] = [values[column] for values in rows.values()]
+            self.placeholder = None if rows else self.EMPTY_TEXT
+            self._fetched = min(self.FETCH_BATCH, len(self._ids))
+            self.endResetModel()
+            return
+
+        # Remove rows of deleted routines (bottom-up so row numbers stay valid)
+        for row in range(len(self._ids) - 1, -1, -1):
+            if self._ids[row] not in rows:
+                self._remove_row(row)
+
+        for row, (routine_id, values) in enumerate(rows.items()):
+            if row < len(self._ids) and self._ids[row] == routine_id:
+                # Existing row in place, signal only the cells that changed
+                changed = [column for column, store in enumerate(self._columns) if store[row] != values[column]]
+                if changed:
+                    for column in changed:
+                        self._columns[column][row] = values[column]
+                    if row < self._fetched:
+                        self.dataChanged.emit(self.index(row, changed[0]), self.index(row, changed[-1]))
+                continue
+
+            # Routine is new or has moved, so (re)insert its row here
+            if routine_id in self._ids:
+                self._remove_row(self._ids.index(routine_id))
+            # Only signal rows the view has fetched, or new rows after a fully fetched list
+            visible = row < self._fetched or self._fetched == len(self._ids)
+            if visible:
+                self.beginInsertRows(QModelIndex(), row, row)
+            self._ids.insert(row, routine_id)
+            for column, store in enumerate(self._columns):
+                store.insert(row, values[column])
+            if visible:
+                self._fetched += 1
+                self.endInsertRows()
+
+    def show_placeholder(self, text):
+        """Show a single placeholder row with the given text instead of the routines"""
+        self.beginResetModel()
+        self._ids.clear()
+        for store in self._columns:
+            store.clear()
+        self.placeholder = text
+        self._fetched = 0
+        self.endResetModel()
+
+    def _remove_row(self, row):
+        """Remove a row from all column stores"""
+        visible = row < self._fetched
+        if visible:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        for store in self._columns:
+            del store[row]
+        if visible:
+            self._fetched -= 1
+            self.endRemoveRows()
 
 
 class RoutinesListWidget(QWidget):
@@ -19,12 +177,13 @@ class RoutinesListWidget(QWidget):
     edit_routine_requested = pyqtSignal(str)  # routine_id
     routine_selected = pyqtSignal(str)  # routine_id
 
+    # Milliseconds to wait for further refresh requests before reloading
+    REFRESH_DELAY = 50
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Set up logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.info("Initializing RoutinesListWidget")
+        logger.info("Initializing RoutinesListWidget")
 
         # Set up the layout
         self.layout = QVBoxLayout(self)
@@ -38,7 +197,7 @@ class RoutinesListWidget(QWidget):
         # Load routines
         self.refresh()
 
-        self.logger.info("RoutinesListWidget initialized")
+        logger.info("RoutinesListWidget initialized")
 
     def setup_button_bar(self):
         """Set up the button bar at the top of the widget"""
@@ -52,9 +211,9 @@ class RoutinesListWidget(QWidget):
 
     def setup_routines_table(self):
         """Set up the table for displaying routines"""
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Name", "Language", "Created"])
+        self.model = RoutinesModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
@@ -66,92 +225,154 @@ class RoutinesListWidget(QWidget):
         self.table.clicked.connect(self.on_table_clicked)
 
         # Connect selection change signal
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
 
-        # Store routine IDs for each row
-        self.routine_ids = []
+        # Whether routines are being loaded, and whether another load was requested meanwhile
+        self._pending = False
+        self._refresh_again = False
 
-        self.layout.addWidget(self.table)
+        # Routines version the table shows or is being loaded with, None if unknown
+        self._requested_version = None
 
-    def refresh(self):
-        """Refresh the routines list"""
-        self.logger.info("Refreshing routines list")
-
-        # Get all routines
-        routines = list_routines()
-
-        # Clear the table and routine IDs
-        self.table.setRowCount(0)
-        self.routine_ids = []
-
-        if not routines:
-            self.logger.info("No routines found")
-            # Add a single row with a message
-            self.table.setRowCount(1)
-            no_routines_item = QTableWidgetItem("No saved routines yet. Click 'Create New Routine' to get started.")
-            no_routines_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setSpan(0, 0, 1, 3)  # Span all columns
-            self.table.setItem(0, 0, no_routines_item)
-            return
+        # Routine selected by the current gesture, emitted once after its click and selection events
+        self._pending_sel = None
 
-        # Add routines to the table
-        self.table.setRowCount(len(routines))
+        # Coalesces bursts of refresh requests into a single reload
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(self.REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(self._do_refresh)
 
-        for row, (routine_id, routine) in enumerate(routines.items()):
-            # Store the routine ID for this row
-            self.routine_ids.append(routine_id)
-            # Name
-            name_item = QTableWidgetItem(routine.get('name', 'Unnamed'))
-            self.table.setItem(row, 0, name_item)
+        # Show that routines are loading until the first refresh completes
+        self.model.show_placeholder(RoutinesModel.LOADING_TEXT)
+        self._update_spans()
 
-            # Language
-            language_code = routine.get('language', 'en')
-            language_name = LANGUAGES.get(language_code, language_code)
-            language_item = QTableWidgetItem(language_name)
-            self.table.setItem(row, 1, language_item)
+        self.layout.addWidget(self.table)
 
-            # Created date
-            created_at = routine.get('created_at', '').split('T')[0]
-            created_item = QTableWidgetItem(created_at)
-            self.table.setItem(row, 2, created_item)
+    def _update_spans(self):
+        """Let the placeholder row span all columns"""
+        self.table.clearSpans()
+        if self.model.placeholder is not None:
+            self.table.setSpan(0, 0, 1, self.model.columnCount())
+
+    def refresh(self):
+        """Schedule a reload of the routines list, coalescing calls in quick succession"""
+        self._refresh_timer.start()
+
+    @pyqtSlot()
+    def _do_refresh(self):
+        """Reload the routines list, reading the routines on a pool thread"""
+        # Skip the reload if no routine changed since the table was (or is being) loaded
+        version = routines_version()
+        if version == self._requested_version:
+            logger.debug("Routines unchanged, skipping refresh")
+            return
 
-        self.logger.info(f"Loaded {len(routines)} routines into table")
+        # Only run one load at a time, reloading once the current one is done
+        if self._pending:
+            self._refresh_again = True
+            return
+        self._pending = True
+        self._requested_version = version
+
+        logger.info("Refreshing routines list")
+        # Build the rows off the GUI thread and apply them when they arrive
+        worker = Worker(list_routine_rows)
+        worker.signals.finished.connect(self._apply_rows, Qt.ConnectionType.QueuedConnection)
+        worker.signals.error.connect(self.on_refresh_failed, Qt.ConnectionType.QueuedConnection)
+        QThreadPool.globalInstance().start(worker)
+
+    @pyqtSlot(str)
+    def on_refresh_failed(self, error):
+        """Allow the next refresh to retry after a failed load"""
+        logger.error("Error loading routines: %s", error)
+        self._requested_version = None
+        self._finish_refresh()
+
+    def _finish_refresh(self):
+        """Mark the current load as done and start the one requested meanwhile, if any"""
+        self._pending = False
+        if self._refresh_again:
+            self._refresh_again = False
+            self._do_refresh()
+
+    @pyqtSlot(object)
+    def _apply_rows(self, rows):
+        """Apply the loaded routine rows to the table model"""
+        # Batch the model changes into a single repaint, without selection signals per removed row
+        selection_model = self.table.selectionModel()
+        selected_before = self.selected_routine_id()
+        self.table.setUpdatesEnabled(False)
+        signals_blocked = selection_model.blockSignals(True)
+        try:
+            self.model.set_rows(rows)
+            self._update_spans()
+            # Keep the selected routine selected when its row moved, e.g. to the top after an update
+            if selected_before is not None and self.selected_routine_id() != selected_before:
+                row = self.model.row_of(selected_before)
+                if row >= 0:
+                    self.table.selectRow(row)
+        finally:
+            selection_model.blockSignals(signals_blocked)
+            self.table.setUpdatesEnabled(True)
+
+        # Report the selection once if the update changed it
+        if self.selected_routine_id() not in (None, selected_before):
+            self.on_selection_changed()
+
+        if rows:
+            logger.info("Loaded %s routines into table", len(rows))
+        else:
+            logger.info("No routines found")
 
-    def on_new_clicked(self):
-        """Handle click on the New Routine button"""
-        self.logger.info("New routine button clicked")
-        self.new_routine_requested.emit()
+        self._finish_refresh()
 
+    def selected_routine_id(self):
+        """Get the ID of the selected routine, or None if no routine is selected"""
+        selected_rows = self.table.selectionModel().selectedRows()
+        return self.model.routine_id(selected_rows[0].row()) if selected_rows else None
 
+    @pyqtSlot()
     def on_selection_changed(self):
         """Handle selection change in the routines table"""
         selected_rows = self.table.selectionModel().selectedRows()
-        self.logger.debug(f"Selection changed: {len(selected_rows)} rows selected, {len(self.routine_ids)} routine IDs available")
+        logger.debug("Selection changed: %s rows selected", len(selected_rows))
 
-        if selected_rows and len(self.routine_ids) > 0:
+        if selected_rows:
             row = selected_rows[0].row()
-            self.logger.debug(f"Selected row index: {row}")
+            logger.debug("Selected row index: %s", row)
 
-            if 0 <= row < len(self.routine_ids):
-                routine_id = self.routine_ids[row]
-                self.logger.info(f"Routine selected: {routine_id}")
-                self.routine_selected.emit(routine_id)
+            routine_id = self.model.routine_id(row)
+            if routine_id is not None:
+                logger.info("Routine selected: %s", routine_id)
+                self.schedule_selection(routine_id)
             else:
-                self.logger.warning(f"Invalid row index: {row}, routine_ids length: {len(self.routine_ids)}")
-        elif not selected_rows:
-            self.logger.debug("No rows selected")
-        elif len(self.routine_ids) == 0:
-            self.logger.debug("No routine IDs available")
+                logger.debug("No routine at row %s", row)
+        else:
+            logger.debug("No rows selected")
 
+    @pyqtSlot('QModelIndex')
     def on_table_clicked(self, index):
         """Handle click on the table"""
         row = index.row()
-        self.logger.debug(f"Table clicked at row {row}")
+        logger.debug("Table clicked at row %s", row)
 
-        if 0 <= row < len(self.routine_ids):
-            routine_id = self.routine_ids[row]
-            self.logger.info(f"Routine selected from table click: {routine_id}")
-            self.routine_selected.emit(routine_id)
+        routine_id = self.model.routine_id(row)
+        if routine_id is not None:
+            logger.info("Routine selected from table click: %s", routine_id)
+            self.schedule_selection(routine_id)
         else:
-            self.logger.warning(f"Invalid row index from click: {row}, routine_ids length: {len(self.routine_ids)}")
-
+            logger.debug("No routine at clicked row %s", row)
+
+    def schedule_selection(self, routine_id):
+        """Emit routine_selected once for all selection events of the current gesture"""
+        if self._pending_sel is None:
+            QTimer.singleShot(0, self._emit_selection)
+        self._pending_sel = routine_id
+
+    @pyqtSlot()
+    def _emit_selection(self):
+        """Emit the pending routine selection"""
+        routine_id, self._pending_sel = self._pending_sel, None
+        if routine_id is not None:
+            self.routine_selected.emit(routine_id)
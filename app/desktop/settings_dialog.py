@@ -1,6 +1,8 @@
 import logging
+import os
 
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
     QComboBox, QSpinBox, QFileDialog, QGroupBox, QFormLayout, QDialogButtonBox,
@@ -10,6 +12,9 @@ from PyQt6.QtWidgets import (
 from app.config import LANGUAGES
 from app.models.settings import settings
 
+# Initialize logger
+logger = logging.getLogger(__name__)
+
 
 class SettingsDialog(QDialog):
     """Dialog for configuring application settings"""
@@ -17,12 +22,16 @@ class SettingsDialog(QDialog):
     # Signal emitted when settings are changed
     settings_changed = pyqtSignal()
 
+    # Language combo box entries shared by all dialogs, built on first use
+    _language_items = None
+
+    # Row of each language code in the language combo box
+    _LANG_INDEX = {code: i for i, code in enumerate(LANGUAGES)}
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        # Set up logging
-        self.logger = logging.getLogger(__name__)
-        self.logger.info("Initializing SettingsDialog")
+        logger.info("Initializing SettingsDialog")
 
         # Set up dialog properties
         self.setWindowTitle("Settings")
@@ -53,7 +62,7 @@ class SettingsDialog(QDialog):
         # Load current settings
         self.load_settings()
 
-        self.logger.info("SettingsDialog initialized")
+        logger.info("SettingsDialog initialized")
 
     def create_data_location_group(self):
         """Create the group for data location settings"""
@@ -82,14 +91,26 @@ class SettingsDialog(QDialog):
 
         # Default language
         self.language_combo = QComboBox()
-        for code, name in LANGUAGES.items():
-            self.language_combo.addItem(name, code)
+        self.language_combo.setModel(SettingsDialog._language_model())
+        self.language_combo.setModelColumn(0)
 
         layout.addRow("Default Language:", self.language_combo)
 
         group.setLayout(layout)
         self.layout.addWidget(group)
 
+    @classmethod
+    def _language_model(cls):
+        """Get the language list model, building it on first use"""
+        if cls._language_items is None:
+            model = QStandardItemModel()
+            for code, name in LANGUAGES.items():
+                item = QStandardItem(name)
+                item.setData(code, Qt.ItemDataRole.UserRole)
+                model.appendRow(item)
+            cls._language_items = model
+        return cls._language_items
+
     def create_performance_group(self):
         """Create the group for performance settings"""
         group = QGroupBox("Performance")
@@ -146,33 +167,46 @@ class SettingsDialog(QDialog):
         # Data directory
         self.data_dir_edit.setText(settings.get_data_dir())
 
+        # Read all other settings at once
+        values = settings.get_many((
+            'default_language', 'audio_threads', 'heading_pause_duration', 'ellipsis_pause_duration',
+            'line_break_pause_duration', 'break_pause_duration'
+        ))
+
         # Default language
-        default_language = settings.get('default_language', 'en')
-        index = self.language_combo.findData(default_language)
+        index = self._LANG_INDEX.get(values['default_language'], -1)
         if index >= 0:
             self.language_combo.setCurrentIndex(index)
 
         # Audio generation threads
-        self.threads_spin.setValue(settings.get('audio_threads', 4))
+        self.threads_spin.setValue(values['audio_threads'])
 
         # Text processing settings
-        self.heading_pause_spin.setValue(settings.get('heading_pause_duration', 5))
-        self.ellipsis_pause_spin.setValue(settings.get('ellipsis_pause_duration', 2))
-        self.line_break_pause_spin.setValue(settings.get('line_break_pause_duration', 2))
-        self.break_pause_spin.setValue(settings.get('break_pause_duration', 5))
+        self.heading_pause_spin.setValue(values['heading_pause_duration'])
+        self.ellipsis_pause_spin.setValue(values['ellipsis_pause_duration'])
+        self.line_break_pause_spin.setValue(values['line_break_pause_duration'])
+        self.break_pause_spin.setValue(values['break_pause_duration'])
 
+        # The fields show the current settings until the dialog is hidden
+        self._settings_loaded = True
+
+    @pyqtSlot()
     def browse_data_dir(self):
         """Open a file dialog to select the data directory"""
-        current_dir = self.data_dir_edit.text()
+        # Start where the last selection was made
+        start_dir = settings.get('last_browse_dir', self.data_dir_edit.text())
         dir_path = QFileDialog.getExistingDirectory(
             self, 
             "Select Data Directory",
-            current_dir
+            start_dir
         )
 
         if dir_path:
             self.data_dir_edit.setText(dir_path)
+            # Saved with the next settings write, so cancelling writes nothing
+            settings.set('last_browse_dir', os.path.dirname(dir_path))
 
+    @pyqtSlot()
     def apply_settings(self):
         """Apply the settings without closing the dialog"""
         # Get the values from the dialog
@@ -196,17 +230,22 @@ class SettingsDialog(QDialog):
                 )
                 return False
 
-        settings.set('default_language', default_language)
-        settings.set('audio_threads', audio_threads)
-        settings.set('heading_pause_duration', heading_pause_duration)
-        settings.set('ellipsis_pause_duration', ellipsis_pause_duration)
-        settings.set('line_break_pause_duration', self.line_break_pause_spin.value())
-        settings.set('break_pause_duration', self.break_pause_spin.value())
+        settings.set_many({
+            'default_language': default_language,
+            'audio_threads': audio_threads,
+            'heading_pause_duration': heading_pause_duration,
+            'ellipsis_pause_duration': ellipsis_pause_duration,
+            'line_break_pause_duration': self.line_break_pause_spin.value(),
+            'break_pause_duration': self.break_pause_spin.value(),
+        })
+
+        # Write the settings file once for all changed values
+        settings.save_settings_if_dirty()
 
         # Emit the settings changed signal
         self.settings_changed.emit()
 
-        self.logger.info("Settings applied")
+        logger.info("Settings applied")
         return True
 
     def accept(self):
@@ -216,6 +255,12 @@ class SettingsDialog(QDialog):
 
     def showEvent(self, event):
         """Called when the dialog is shown"""
-        # Reload settings in case they've changed
-        self.load_settings()
+        # Reload settings in case they've changed while the dialog was hidden
+        if not self._settings_loaded:
+            self.load_settings()
         super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Called when the dialog is hidden"""
+        self._settings_loaded = False
+        super().hideEvent(event)
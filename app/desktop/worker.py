@@ -0,0 +1,45 @@
+"""
+Generic QThreadPool worker for running blocking calls off the UI thread.
+The result (or error message) is delivered back through Qt signals.
+"""
+
+import logging
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a Worker"""
+
+    finished = pyqtSignal(object)  # return value of the function
+    error = pyqtSignal(str)  # error message
+
+
+class Worker(QRunnable):
+    """QRunnable that calls a function with the given arguments on a pool thread"""
+
+    def __init__(self, fn, *args, **kwargs):
+        """
+        Initialize the worker.
+
+        Args:
+            fn: Function to call on the worker thread
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+        """
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        """Call the function and emit its result or error"""
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.logger.error(f"Error in worker {getattr(self.fn, '__name__', self.fn)}: {str(e)}")
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
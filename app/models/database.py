@@ -1,4 +1,8 @@
+import atexit
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
 
 from app.models.settings import settings
@@ -6,19 +10,93 @@ from app.models.settings import settings
 # Define the database file
 DB_FILE = settings.get_db_file()
 
+# One connection per thread, reused across calls
+_tls = threading.local()
+
+# All open connections, so they can be closed at exit
+_connections = set()
+_connections_lock = threading.Lock()
+
+
+class _ConnectionHolder:
+    """Thread-local holder of a connection, which closes it once the thread releases its local data"""
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+        weakref.finalize(self, _close_connection, conn)
+
+
+# RETURNING clauses need SQLite 3.35; older versions read the written row with a separate SELECT
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_RETURNING = "RETURNING *" if _HAS_RETURNING else ""
+
+# Updatable columns of the routines table, read from the schema on first use
+_valid_columns = None
+
+# UPDATE statements by the tuple of columns they set, so SQLite's statement cache can reuse them
+_update_sql_cache = {}
+
 def get_db_connection():
-    """Get a connection to the SQLite database"""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row  # This enables column access by name
-    return conn
+    """Get the calling thread's connection to the SQLite database, opening it on first use"""
+    holder = getattr(_tls, 'holder', None)
+    if holder is None:
+        # Allow closing from the exit handler, which runs on the main thread, and
+        # manage transactions explicitly instead of letting sqlite3 open them implicitly
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row  # This enables column access by name
+        # With WAL, NORMAL only syncs at checkpoints and is still safe against corruption
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")
+        with _connections_lock:
+            _connections.add(conn)
+        # Pool threads come and go, so their connections are closed when they end
+        holder = _tls.holder = _ConnectionHolder(conn)
+    return holder.conn
+
+def _close_connection(conn):
+    """Close a connection that has not been closed yet"""
+    with _connections_lock:
+        if conn not in _connections:
+            return
+        _connections.discard(conn)
+    conn.close()
+
+@contextmanager
+def write_transaction():
+    """Run the statements of the block in one transaction that takes the write lock up front"""
+    conn = get_db_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn.cursor()
+        conn.execute("COMMIT")
+    except BaseException:
+        # Also roll back a failed COMMIT, so the connection does not stay inside the transaction
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+@atexit.register
+def close_db_connections():
+    """Close all open database connections"""
+    with _connections_lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
 
 def init_db():
     """Initialize the database schema using Alembic migrations"""
     # Import here to avoid circular imports
-    from app.models.migrations import run_migrations
+    from app.models.migrations import check_migrations, run_migrations
 
-    # Run migrations to ensure the database schema is up to date
-    run_migrations()
+    # Run migrations only if the database schema is not up to date
+    if check_migrations():
+        run_migrations()
+
+    # Switch to write-ahead logging, which is stored in the database file and persists
+    get_db_connection().execute("PRAGMA journal_mode=WAL")
 
 def get_routine(routine_id):
     """Get a routine by ID"""
@@ -28,35 +106,26 @@ def get_routine(routine_id):
     cursor.execute("SELECT * FROM routines WHERE id = ?", (routine_id,))
     routine = cursor.fetchone()
 
-    conn.close()
-
     if routine:
         return dict(routine)
     return None
 
 def list_routines():
-    """List all routines"""
+    """List all routines, most recently updated first"""
     conn = get_db_connection()
     cursor = conn.cursor()
+    # Plain tuples are cheaper to build than sqlite3.Row objects
+    cursor.row_factory = None
 
-    cursor.execute("SELECT * FROM routines")
-    routines = cursor.fetchall()
-
-    conn.close()
+    cursor.execute("SELECT * FROM routines ORDER BY updated_at DESC")
+    columns = [column[0] for column in cursor.description]
+    id_index = columns.index('id')
 
     # Convert to dictionary with routine_id as key
-    result = {}
-    for routine in routines:
-        routine_dict = dict(routine)
-        result[routine_dict['id']] = routine_dict
-
-    return result
+    return {row[id_index]: dict(zip(columns, row)) for row in cursor}
 
 def add_routine(name, text, language, voice_type, voice_id=None, output_filename=None, routine_id=None):
     """Add a new routine"""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
     # Use provided ID or generate a new one
     from uuid import uuid4
     if routine_id is None:
@@ -64,68 +133,73 @@ def add_routine(name, text, language, voice_type, voice_id=None, output_filename
 
     now = datetime.now().isoformat()
 
-    cursor.execute('''
-    INSERT INTO routines (id, name, text, language, voice_type, voice_id, output_filename, created_at, updated_at)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (routine_id, name, text, language, voice_type, voice_id, output_filename, now, now))
+    with write_transaction() as cursor:
+        cursor.execute(f'''
+        INSERT INTO routines (id, name, text, language, voice_type, voice_id, output_filename, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        {_RETURNING}
+        ''', (routine_id, name, text, language, voice_type, voice_id, output_filename, now, now))
+        routine = cursor.fetchone() if _HAS_RETURNING else _select_routine(cursor, routine_id)
 
-    conn.commit()
-    conn.close()
+    return dict(routine)
 
-    return get_routine(routine_id)
+def _select_routine(cursor, routine_id):
+    """Read a routine row within the current transaction, for SQLite versions without RETURNING"""
+    cursor.execute("SELECT * FROM routines WHERE id = ?", (routine_id,))
+    return cursor.fetchone()
+
+def _routine_columns():
+    """Get the columns of the routines table that can be updated, reading the schema once"""
+    global _valid_columns
+    if _valid_columns is None:
+        rows = get_db_connection().execute("PRAGMA table_info(routines)").fetchall()
+        _valid_columns = frozenset(row['name'] for row in rows) - {'id'}  # Don't update the ID
+    return _valid_columns
 
 def update_routine(routine_id, **kwargs):
     """Update an existing routine"""
-    routine = get_routine(routine_id)
-    if not routine:
-        return None
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # Update only the fields that are provided
-    updates = []
-    values = []
-
-    for key, value in kwargs.items():
-        if key in routine and key != 'id':  # Don't update the ID
-            updates.append(f"{key} = ?")
-            values.append(value)
+    # Update only the fields that are provided, in a fixed order so the SQL can be reused
+    valid_columns = _routine_columns()
+    columns = tuple(sorted(key for key in kwargs if key in valid_columns))
+
+    sql = _update_sql_cache.get(columns)
+    if sql is None:
+        # Always update the updated_at timestamp
+        updates = [f"{column} = ?" for column in columns] + ["updated_at = ?"]
+        sql = f'''
+    UPDATE routines
+    SET {", ".join(updates)}
+    WHERE id = ?
+    {_RETURNING}
+    '''
+        _update_sql_cache[columns] = sql
 
-    # Always update the updated_at timestamp
-    updates.append("updated_at = ?")
+    values = [kwargs[column] for column in columns]
     values.append(datetime.now().isoformat())
-
     # Add the routine_id for the WHERE clause
     values.append(routine_id)
 
-    # Execute the update query
-    cursor.execute(f'''
-    UPDATE routines
-    SET {", ".join(updates)}
-    WHERE id = ?
-    ''', values)
-
-    conn.commit()
-    conn.close()
+    # Execute the update query; no row is returned if the routine does not exist
+    with write_transaction() as cursor:
+        cursor.execute(sql, values)
+        routine = cursor.fetchone() if _HAS_RETURNING else _select_routine(cursor, routine_id)
 
-    return get_routine(routine_id)
+    return dict(routine) if routine else None
 
 def delete_routine(routine_id):
     """Delete a routine by ID"""
-    routine = get_routine(routine_id)
-    if not routine:
-        return False
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("DELETE FROM routines WHERE id = ?", (routine_id,))
-
-    conn.commit()
-    conn.close()
-
-    return True
+    return pop_routine(routine_id) is not None
+
+def pop_routine(routine_id):
+    """Delete a routine by ID and return the deleted routine, or None if it did not exist"""
+    with write_transaction() as cursor:
+        if not _HAS_RETURNING:
+            routine = _select_routine(cursor, routine_id)
+        cursor.execute(f"DELETE FROM routines WHERE id = ? {_RETURNING}", (routine_id,))
+        if _HAS_RETURNING:
+            routine = cursor.fetchone()
+
+    return dict(routine) if routine else None
 
 # Initialize the database when this module is imported
 init_db()
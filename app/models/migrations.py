@@ -1,5 +1,7 @@
 import logging
 import os
+import sqlite3
+from contextlib import closing
 
 import alembic.config
 from alembic import command
@@ -19,44 +21,66 @@ logger = logging.getLogger(__name__)
 #
 # For more information on how to use Alembic, see the README.md file in the migrations directory.
 
+# Alembic configuration and the database file it was built for, reused until the data directory changes
+_config = None
+_config_db_file = None
+
+# Migration scripts, which do not change while the application runs
+_script = None
+
 def get_alembic_config():
-    """Get the Alembic configuration"""
+    """Get the Alembic configuration, reading alembic.ini only once per database file"""
+    global _config, _config_db_file
+    db_file = settings.get_db_file()
+    if _config is not None and _config_db_file == db_file:
+        return _config
+
     # Get the path to the alembic.ini file
     alembic_ini = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'alembic.ini')
 
     # Create the Alembic configuration
     config = alembic.config.Config(alembic_ini)
 
+    # Resolve the scripts folder next to alembic.ini rather than the working directory
+    config.set_main_option("script_location", os.path.join(os.path.dirname(alembic_ini), 'migrations'))
+
     # Override the SQLAlchemy URL with the actual database file path
-    db_file = settings.get_db_file()
     db_url = f"sqlite:///{db_file}"
     config.set_main_option("sqlalchemy.url", db_url)
 
+    _config, _config_db_file = config, db_file
     return config
 
+def get_script_directory():
+    """Get the migration scripts, scanning the versions folder only once"""
+    global _script
+    if _script is None:
+        from alembic.script import ScriptDirectory
+        _script = ScriptDirectory.from_config(get_alembic_config())
+    return _script
+
+def get_head_revision():
+    """Get the head revision of the migration scripts"""
+    return get_script_directory().get_current_head()
+
+def get_current_revision():
+    """Get the revision the database is at, or None if it has not been migrated yet"""
+    # A plain SQLite query is enough to read the version table
+    with closing(sqlite3.connect(settings.get_db_file())) as conn:
+        try:
+            row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+        except sqlite3.OperationalError:
+            # The version table does not exist yet
+            return None
+    return row[0] if row else None
+
 def check_migrations():
     """Check if there are any pending migrations"""
     logger.info("Checking for pending database migrations")
-    config = get_alembic_config()
-
-    # Get the current revision
-    from alembic.script import ScriptDirectory
-    script = ScriptDirectory.from_config(config)
-
-    # Get the database revision
-    from alembic.runtime.migration import MigrationContext
-    from sqlalchemy import create_engine
-
-    db_file = settings.get_db_file()
-    db_url = f"sqlite:///{db_file}"
-    engine = create_engine(db_url)
-
-    with engine.connect() as conn:
-        context = MigrationContext.configure(conn)
-        current_rev = context.get_current_revision()
 
-    # Get the head revision
-    head_rev = script.get_current_head()
+    # Get the database and head revisions
+    current_rev = get_current_revision()
+    head_rev = get_head_revision()
 
     # Check if we need to upgrade
     if current_rev != head_rev:
@@ -82,12 +106,15 @@ def run_migrations():
 
 def create_migration(message):
     """Create a new migration script"""
+    global _script
     logger.info(f"Creating new migration: {message}")
     config = get_alembic_config()
 
     try:
         # Create a new revision
         command.revision(config, message=message, autogenerate=True)
+        # Scan the scripts again to pick up the new revision
+        _script = None
         logger.info("Migration script created successfully")
         return True
     except Exception as e:
@@ -1,9 +1,46 @@
 import os
-import uuid
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Optional
 
-from app.config import OUTPUT_FOLDER
+from app.config import LANGUAGES, OUTPUT_FOLDER
 from app.models.database import get_routine as db_get_routine, list_routines as db_list_routines, \
-    add_routine as db_add_routine, update_routine as db_update_routine, delete_routine as db_delete_routine
+    add_routine as db_add_routine, update_routine as db_update_routine, pop_routine as db_pop_routine
+
+# Cached results of list_routines and list_routine_rows, None until loaded or after a change to the routines
+_routines_cache = None
+_rows_cache = None
+
+# Number of changes made to the routines, so views can tell whether their data is current
+_routines_version = 0
+
+# Guards the caches and the version, as routines are listed on pool threads
+_cache_lock = threading.Lock()
+
+
+def invalidate_routines_cache():
+    """Drop the cached routine list so the next list_routines call reads the database"""
+    global _routines_cache, _rows_cache, _routines_version
+    with _cache_lock:
+        _routines_cache = None
+        _rows_cache = None
+        _routines_version += 1
+
+
+def routines_version():
+    """Get the number of changes made to the routines so far"""
+    return _routines_version
+
+
+@dataclass(slots=True)
+class RoutineRow:
+    """Display fields of a routine, formatted for the routines list"""
+    id: str
+    name: str
+    language_name: str
+    created_date: str
+    output_filename: Optional[str] = None
 
 
 def get_routine(routine_id):
@@ -11,24 +48,55 @@ def get_routine(routine_id):
     return db_get_routine(routine_id)
 
 def list_routines():
-    """List all routines"""
-    return db_list_routines()
+    """List all routines, read from the database only after a change"""
+    global _routines_cache
+    routines = _routines_cache
+    if routines is None:
+        version = _routines_version
+        routines = db_list_routines()
+        # Don't cache the result if a routine changed while reading (e.g. when listing on a pool thread)
+        with _cache_lock:
+            if version == _routines_version:
+                _routines_cache = routines
+    # Return a copy so callers cannot change the cached list
+    return dict(routines)
+
+def list_routine_rows():
+    """List all routines as display rows, formatted once per change to the routines"""
+    global _rows_cache
+    rows = _rows_cache
+    if rows is None:
+        version = _routines_version
+        rows = []
+        _lang_get = LANGUAGES.get
+        for routine_id, routine in list_routines().items():
+            language_code = routine.get('language', 'en')
+            rows.append(RoutineRow(
+                id=routine_id,
+                name=routine.get('name', 'Unnamed'),
+                # Intern the names so rows of the same language share one string
+                language_name=sys.intern(_lang_get(language_code, language_code)),
+                created_date=routine.get('created_at', '')[:10],
+                output_filename=routine.get('output_filename'),
+            ))
+        with _cache_lock:
+            if version == _routines_version:
+                _rows_cache = rows
+    return list(rows)
 
 def add_routine(name, text, language, voice_type, voice_id=None, output_filename=None):
     """Add a new routine"""
-    # Generate a unique ID
-    routine_id = str(uuid.uuid4())
-
-    # Add the routine to the database
-    return db_add_routine(
+    # Add the routine to the database, which generates its ID
+    routine = db_add_routine(
         name=name,
         text=text,
         language=language,
         voice_type=voice_type,
         voice_id=voice_id,
-        output_filename=output_filename,
-        routine_id=routine_id
+        output_filename=output_filename
     )
+    invalidate_routines_cache()
+    return routine
 
 def update_routine(routine_id, output_filename=None, **kwargs):
     """Update an existing routine"""
@@ -37,15 +105,18 @@ def update_routine(routine_id, output_filename=None, **kwargs):
         kwargs['output_filename'] = output_filename
 
     # Update the routine in the database
-    return db_update_routine(routine_id, **kwargs)
+    routine = db_update_routine(routine_id, **kwargs)
+    invalidate_routines_cache()
+    return routine
 
 def delete_routine(routine_id):
     """Delete a routine by ID"""
-    # Get the routine to check if it exists and to get the output_filename
-    routine = get_routine(routine_id)
+    # Delete the routine from the database, which also returns its output_filename
+    routine = db_pop_routine(routine_id)
 
     if not routine:
         return False
+    invalidate_routines_cache()
 
     # Delete the audio file if it exists
     output_filename = routine.get('output_filename')
@@ -57,5 +128,4 @@ def delete_routine(routine_id):
             except OSError:
                 pass  # Ignore errors when deleting the file
 
-    # Delete the routine from the database
-    return db_delete_routine(routine_id)
+    return True
@@ -1,3 +1,4 @@
+import atexit
 import json
 import logging
 import os
@@ -22,6 +23,10 @@ class Settings:
         self.logger = logging.getLogger(__name__)
         self.settings = self.DEFAULT_SETTINGS.copy()
         self.settings_file = None
+        # Directories already created in this session
+        self._created_dirs = set()
+        # Whether there are changes that have not been saved yet
+        self._dirty = False
         self.load_settings()
 
     def load_settings(self):
@@ -59,6 +64,7 @@ class Settings:
         try:
             with open(self.settings_file, 'w') as f:
                 json.dump(self.settings, f, indent=2)
+            self._dirty = False
             self.logger.info(f"Settings saved to {self.settings_file}")
             return True
         except IOError as e:
@@ -69,17 +75,38 @@ class Settings:
         """Get a setting value"""
         return self.settings.get(key, default)
 
-    def set(self, key, value):
-        """Set a setting value"""
-        self.settings[key] = value
+    def get_many(self, keys):
+        """Get several setting values as a dict, falling back to the defaults"""
+        return {key: self.settings.get(key, self.DEFAULT_SETTINGS.get(key)) for key in keys}
+
+    def save_settings_if_dirty(self):
+        """Save settings to the settings file if they have changed since the last save"""
+        if not self._dirty:
+            return True
         return self.save_settings()
 
+    def set(self, key, value):
+        """Set a setting value, to be saved by save_settings_if_dirty()"""
+        self.set_many({key: value})
+
+    def set_many(self, values):
+        """Set several setting values, to be saved by save_settings_if_dirty()"""
+        for key, value in values.items():
+            if self.settings.get(key) != value:
+                self.settings[key] = value
+                self._dirty = True
+
+    def _ensure_dir(self, path):
+        """Create a directory once per session and return its path"""
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+        return path
+
     def get_data_dir(self):
         """Get the data directory"""
-        data_dir = self.get('data_dir')
         # Ensure the directory exists
-        os.makedirs(data_dir, exist_ok=True)
-        return data_dir
+        return self._ensure_dir(self.get('data_dir'))
 
     def set_data_dir(self, data_dir):
         """Set the data directory"""
@@ -92,14 +119,13 @@ class Settings:
                 return False
 
         # Set the new data directory
-        return self.set('data_dir', data_dir)
+        self.set('data_dir', data_dir)
+        return True
 
 
     def get_output_folder(self):
         """Get the output folder"""
-        output_folder = os.path.join(self.get_data_dir(), 'output')
-        os.makedirs(output_folder, exist_ok=True)
-        return output_folder
+        return self._ensure_dir(os.path.join(self.get_data_dir(), 'output'))
 
     def get_db_file(self):
         """Get the database file path"""
@@ -107,3 +133,6 @@ class Settings:
 
 # Create a singleton instance
 settings = Settings()
+
+# Save any pending changes when the application exits
+atexit.register(settings.save_settings_if_dirty)
@@ -9,11 +9,19 @@ import threading
 import time
 import uuid
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Callable, Dict, Optional, Union
 
 from app.audio import generate_audio
 from app.models.routine import add_routine, update_routine, get_routine
 
+# Pool for file clean-up, so the task thread does not wait for it
+_io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="task-io")
+
+
+class TaskCancelled(Exception):
+    """Raised on the task thread to stop a task whose cancellation was requested"""
+
 
 class TaskProgressNotifier(ABC):
     """
@@ -48,6 +56,9 @@ class BaseTaskManager:
     Handles the common functionality for managing audio generation tasks.
     """
     
+    # Minimum seconds between progress updates that do not change the percentage
+    PROGRESS_MIN_INTERVAL = 0.5
+    
     def __init__(self, progress_notifier: TaskProgressNotifier):
         """
         Initialize the task manager.
@@ -57,16 +68,21 @@ class BaseTaskManager:
         """
         # Set up logging
         self.logger = logging.getLogger(__name__)
-        self.logger.info("Initializing BaseTaskManager")
+        self.logger.debug("Initializing BaseTaskManager")
         
         # Store the progress notifier
         self.progress_notifier = progress_notifier
         
         # Initialize variables
         self.current_task = None
-        self.cancel_requested = False
+        self.cancel_event = threading.Event()
         
-        self.logger.info("BaseTaskManager initialized")
+        self.logger.debug("BaseTaskManager initialized")
+    
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether cancellation of the current task was requested"""
+        return self.cancel_event.is_set()
     
     def is_task_running(self) -> bool:
         """
@@ -81,7 +97,7 @@ class BaseTaskManager:
         """Request cancellation of the current task"""
         if self.is_task_running():
             self.logger.info("Task cancellation requested")
-            self.cancel_requested = True
+            self.cancel_event.set()
     
     def start_task(self, text: str, language: str, voice_path: str, routine_name: str, 
                   routine_id: Optional[str] = None, voice_type: Optional[str] = None, 
@@ -107,31 +123,57 @@ class BaseTaskManager:
         self.logger.info(f"Starting task {task_id} for routine '{routine_name}'")
         
         # Reset cancellation flag
-        self.cancel_requested = False
+        self.cancel_event.clear()
         
         # Create and start the task thread
-        self.current_task = threading.Thread(
-            target=self._run_task,
-            args=(task_id, text, language, voice_path, routine_name, routine_id, voice_type, voice_id, num_threads)
+        self.current_task = self._start_worker(
+            task_id, text, language, voice_path, routine_name, routine_id, voice_type, voice_id, num_threads
         )
-        self.current_task.daemon = True
-        self.current_task.start()
         
         # Notify that the task has started
         self.progress_notifier.notify_started(task_id)
         
-        self.logger.info(f"Task thread started for routine '{routine_name}'")
+        self.logger.debug("Task thread started for routine '%s'", routine_name)
         return task_id
     
-    def _cleanup_temp_file(self, voice_type: Optional[str], voice_path: str) -> None:
+    def _start_worker(self, *args: Any) -> Any:
         """
-        Clean up temporary voice file if needed.
+        Run _run_task in a new background thread.
+        
+        Args:
+            *args: Arguments for _run_task
+            
+        Returns:
+            threading.Thread: The started thread, kept as the current task
+        """
+        thread = threading.Thread(target=self._run_task, args=args)
+        thread.daemon = True
+        thread.start()
+        return thread
+    
+    def _cleanup_temp_file(self, voice_type: Optional[str], voice_path: str) -> Optional[Future]:
+        """
+        Clean up temporary voice file if needed, in the background.
         
         Args:
             voice_type: Type of voice (sample or upload)
             voice_path: Path to the voice sample file
+            
+        Returns:
+            Optional[Future]: The pending clean-up, or None if the file is not a temporary upload
+        """
+        if voice_type == 'upload' and 'temp_' in os.path.basename(voice_path):
+            return _io_executor.submit(self._remove_temp_file, voice_path)
+        return None
+    
+    def _remove_temp_file(self, voice_path: str) -> None:
         """
-        if voice_type == 'upload' and os.path.exists(voice_path) and 'temp_' in os.path.basename(voice_path):
+        Remove a temporary voice file if it exists.
+        
+        Args:
+            voice_path: Path to the voice sample file
+        """
+        if os.path.exists(voice_path):
             self.logger.debug(f"Cleaning up temporary voice file: {voice_path}")
             try:
                 os.remove(voice_path)
@@ -149,16 +191,25 @@ class BaseTaskManager:
         Returns:
             bool: True if task was cancelled, False otherwise
         """
-        if self.cancel_requested:
+        if self.cancel_event.is_set():
             self.logger.info(message)
-            self.progress_notifier.notify_failed(task_id, "Task cancelled")
-            # Reset the current task to None to properly clean up the task state
-            self.current_task = None
-            # Reset the cancellation flag
-            self.cancel_requested = False
+            self._notify_cancelled(task_id)
             return True
         return False
     
+    def _notify_cancelled(self, task_id: str) -> None:
+        """
+        Report a cancelled task and reset the task state.
+        
+        Args:
+            task_id: ID of the task
+        """
+        self.progress_notifier.notify_failed(task_id, "Task cancelled")
+        # Reset the current task to None to properly clean up the task state
+        self.current_task = None
+        # Reset the cancellation flag
+        self.cancel_event.clear()
+    
     def _run_task(self, task_id: str, text: str, language: str, voice_path: str, 
                  routine_name: str, routine_id: Optional[str] = None, 
                  voice_type: Optional[str] = None, voice_id: Optional[str] = None,
@@ -177,7 +228,7 @@ class BaseTaskManager:
             voice_id: ID of the sample voice if using a sample
             num_threads: Number of threads to use for audio generation
         """
-        self.logger.info(f"Running task {task_id} for routine '{routine_name}'")
+        self.logger.debug("Running task %s for routine '%s'", task_id, routine_name)
         
         try:
             # Update progress
@@ -188,19 +239,29 @@ class BaseTaskManager:
                 return
             
             # Generate the audio file
-            self.logger.info(f"Generating audio for routine '{routine_name}'")
+            self.logger.debug("Generating audio for routine '%s'", routine_name)
             self._update_progress(task_id, 0, "Generating audio...")
             
-            # Define a progress callback function
+            # Define a progress callback function that drops updates without visible progress
+            last_percent = None
+            last_update = 0.0
+            
             def progress_callback(percent, message):
-                self._update_progress(task_id, percent, message)
-                # Check for cancellation during audio generation
-                return not self.cancel_requested
+                nonlocal last_percent, last_update
+                # Stop the generation between segments as soon as cancellation is requested
+                if self.cancel_event.is_set():
+                    raise TaskCancelled()
+                now = time.monotonic()
+                if percent != last_percent or percent in (0, 100) or now - last_update >= self.PROGRESS_MIN_INTERVAL:
+                    self._update_progress(task_id, percent, message)
+                    last_percent = percent
+                    last_update = now
+                return True
             
             # Generate the audio
             output_filename = self._generate_audio(text, language, voice_path, routine_name, num_threads, progress_callback)
             
-            self.logger.info(f"Audio generation completed: {output_filename}")
+            self.logger.debug("Audio generation completed: %s", output_filename)
             self._update_progress(task_id, 100, "Audio generation completed. Saving routine...")
             
             # Check for cancellation
@@ -233,6 +294,14 @@ class BaseTaskManager:
             
             self.logger.info(f"Task completed successfully for routine '{routine_name}'")
             
+        except TaskCancelled:
+            self.logger.info("Task cancelled during audio generation")
+            
+            # Clean up temporary uploaded file if needed
+            self._cleanup_temp_file(voice_type, voice_path)
+            
+            self._notify_cancelled(task_id)
+            
         except Exception as e:
             # Log the error
             self.logger.error(f"Error in task: {str(e)}", exc_info=True)
@@ -300,7 +369,7 @@ class BaseTaskManager:
         """
         if routine_id and get_routine(routine_id):
             # Update existing routine
-            self.logger.info(f"Updating existing routine {routine_id}")
+            self.logger.debug("Updating existing routine %s", routine_id)
             routine = update_routine(
                 routine_id,
                 output_filename=output_filename,
@@ -310,10 +379,10 @@ class BaseTaskManager:
                 voice_type=voice_type,
                 voice_id=voice_id
             )
-            self.logger.info(f"Routine {routine_id} updated successfully")
+            self.logger.debug("Routine %s updated successfully", routine_id)
         else:
             # Create new routine
-            self.logger.info(f"Creating new routine")
+            self.logger.debug("Creating new routine")
             routine = add_routine(
                 name=routine_name,
                 text=text,
@@ -322,6 +391,6 @@ class BaseTaskManager:
                 voice_id=voice_id,
                 output_filename=output_filename
             )
-            self.logger.info(f"New routine created with ID {routine['id']}")
+            self.logger.debug("New routine created with ID %s", routine['id'])
         
         return routine
\ No newline at end of file
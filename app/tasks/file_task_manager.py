@@ -115,8 +115,6 @@ class FileTaskProgressNotifier(TaskProgressNotifier):
             percent: Progress percentage (0-100)
             message: Progress message
         """
-        self.logger.debug(f"Task {task_id} progress: {percent}% - {message}")
-        
         # Load current task data
         task_data = self._load_task(task_id)
         if not task_data:
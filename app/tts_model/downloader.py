@@ -0,0 +1,309 @@
+"""
+Model file downloader.
+Streams the TTS model files over HTTP and reports the number of bytes downloaded.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# Size of the chunks read from the response stream
+CHUNK_SIZE = 1024 * 1024
+
+# Timeout in seconds for connecting to and reading from the server
+REQUEST_TIMEOUT = 30
+
+# Number of files downloaded in parallel
+DOWNLOAD_WORKERS = 4
+
+# Maximum number of pooled connections per host, one for each download worker
+POOL_MAXSIZE = DOWNLOAD_WORKERS
+
+# Base URL of the Hugging Face Hub
+HF_URL = "https://huggingface.co"
+
+# Name of the cached repository manifest in the output directory
+MANIFEST_FILE = ".manifest.json"
+
+# Seconds a cached repository manifest stays valid
+MANIFEST_TTL = 24 * 60 * 60
+
+# Shared session so all model files reuse the same keep-alive connections
+_session = None
+
+
+def get_session():
+    """
+    Get the shared HTTP session, creating it on first use.
+
+    Returns:
+        requests.Session: Session with a pooled, retrying HTTPS adapter
+    """
+    global _session
+    if _session is None:
+        retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        # Two host pools: the model host and the CDN it redirects the large files to
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
+def prime_connection():
+    """
+    Open a pooled connection to the model host ahead of a download.
+
+    Errors are only logged, as the download itself will report them.
+    """
+    try:
+        # Go through the session's own connection pool, but without its retries
+        pool = get_session().get_adapter(HF_URL).poolmanager.connection_from_url(HF_URL)
+        pool.urlopen("HEAD", "/", retries=False, timeout=5)
+        logger.debug(f"Primed connection to {HF_URL}")
+    except Exception as e:
+        logger.debug(f"Could not prime connection to {HF_URL}: {str(e)}")
+
+
+def get_remote_info(url):
+    """
+    Get the size and ETag of a remote file.
+
+    Args:
+        url (str): URL of the file
+
+    Returns:
+        tuple: (size in bytes or 0 if the server does not report it, ETag or None)
+    """
+    response = get_session().head(url, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return int(response.headers.get("content-length", 0)), response.headers.get("etag")
+
+
+def read_etag(file_path):
+    """
+    Read the ETag stored next to a downloaded file.
+
+    Args:
+        file_path (str): Path of the downloaded file
+
+    Returns:
+        str or None: The stored ETag, or None if there is none
+    """
+    try:
+        with open(file_path + ".etag", "r") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def write_etag(file_path, etag):
+    """
+    Store the ETag of a file next to it.
+
+    Args:
+        file_path (str): Path of the downloaded file
+        etag (str or None): ETag reported by the server
+    """
+    etag_path = file_path + ".etag"
+    if etag:
+        with open(etag_path, "w") as f:
+            f.write(etag)
+    elif os.path.exists(etag_path):
+        os.remove(etag_path)
+
+
+def download_file(url, file_path, etag=None, chunk_callback=None):
+    """
+    Download a single file, resuming a partial download of the same version.
+
+    The data is written to a .partial file that is renamed once complete. The ETag of a
+    partial download is kept next to the .partial file and only stored for the file itself
+    once the download is complete. If a file with the same ETag has already been downloaded,
+    nothing is fetched.
+
+    Args:
+        url (str): URL of the file
+        file_path (str): Path to write the file to
+        etag (str, optional): Current ETag or other version identifier of the remote file
+        chunk_callback (callable, optional): Called with the number of bytes written to disk,
+            including bytes already present from an earlier download
+    """
+    partial_path = file_path + ".partial"
+
+    # Skip files that are already downloaded and unchanged
+    if etag is not None and read_etag(file_path) == etag and os.path.exists(file_path):
+        logger.debug(f"Skipping {url}, {file_path} is up to date")
+        if chunk_callback:
+            chunk_callback(os.path.getsize(file_path))
+        return
+
+    # Resume a partial download only if it belongs to the same version of the file
+    same_version = etag is not None and read_etag(partial_path) == etag
+    offset = os.path.getsize(partial_path) if same_version and os.path.exists(partial_path) else 0
+    write_etag(partial_path, etag)
+
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    logger.debug(f"Downloading {url} to {file_path} (starting at byte {offset})")
+
+    with get_session().get(url, stream=True, headers=headers, timeout=REQUEST_TIMEOUT) as response:
+        if offset and response.status_code == 416:
+            # The partial file already holds the whole file
+            mode = None
+        else:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # The server ignored the range request, so start over
+                logger.debug(f"Server did not resume {url}, downloading the whole file")
+                offset = 0
+            mode = "ab" if offset else "wb"
+
+        if offset and chunk_callback:
+            chunk_callback(offset)
+
+        if mode:
+            with open(partial_path, mode) as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    if chunk_callback:
+                        chunk_callback(len(chunk))
+
+    os.replace(partial_path, file_path)
+
+    # Only a complete file takes over the version of the download
+    write_etag(file_path, etag)
+    write_etag(partial_path, None)
+
+
+def get_manifest(repo_id, revision, cache_dir):
+    """
+    Get the sizes and versions of all files in a Hugging Face model repository.
+
+    The listing is fetched with a single API call and cached in cache_dir for MANIFEST_TTL seconds.
+
+    Args:
+        repo_id (str): Repository ID, e.g. "coqui/XTTS-v2"
+        revision (str): Branch, tag or commit
+        cache_dir (str): Directory to cache the manifest in
+
+    Returns:
+        dict: {path: (size in bytes, version)} where the version is the LFS SHA-256 or the git blob ID
+    """
+    cache_path = os.path.join(cache_dir, MANIFEST_FILE)
+
+    # Use the cached listing if it is recent enough
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < MANIFEST_TTL:
+        try:
+            with open(cache_path, "r") as f:
+                entries = json.load(f)
+            logger.debug(f"Using cached manifest {cache_path}")
+        except (OSError, ValueError):
+            entries = None
+    else:
+        entries = None
+
+    if entries is None:
+        url = f"{HF_URL}/api/models/{repo_id}/tree/{revision}?recursive=true"
+        response = get_session().get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        entries = response.json()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(entries, f)
+
+    manifest = {}
+    for entry in entries:
+        if entry.get("type") != "file":
+            continue
+        lfs = entry.get("lfs")
+        if lfs:
+            manifest[entry["path"]] = (lfs["size"], lfs["oid"])
+        else:
+            manifest[entry["path"]] = (entry["size"], entry["oid"])
+    return manifest
+
+
+def download_repo_files(repo_id, files, output_dir, progress_callback=None, revision="main"):
+    """
+    Download files from a Hugging Face model repository.
+
+    Sizes and versions come from the repository manifest instead of one HEAD request per file.
+
+    Args:
+        repo_id (str): Repository ID, e.g. "coqui/XTTS-v2"
+        files (list): Paths of the files in the repository
+        output_dir (str): Directory to store the files in
+        progress_callback (callable, optional): Called as progress_callback(bytes_done, bytes_total)
+        revision (str): Branch, tag or commit
+    """
+    file_urls = [f"{HF_URL}/{repo_id}/resolve/{revision}/{file}" for file in files]
+
+    try:
+        manifest = get_manifest(repo_id, revision, output_dir)
+    except (requests.RequestException, ValueError) as e:
+        # Fall back to asking for each file separately
+        logger.warning(f"Could not get the manifest of {repo_id}: {str(e)}")
+        manifest = {}
+
+    remote_info = {url: manifest[file] for url, file in zip(file_urls, files) if file in manifest}
+    download_files(file_urls, output_dir, progress_callback, remote_info)
+
+
+def download_files(file_urls, output_dir, progress_callback=None, remote_info=None):
+    """
+    Download files in parallel into a directory, reporting the overall progress.
+
+    Files that are unchanged since an earlier download are skipped and interrupted
+    downloads are resumed.
+
+    Args:
+        file_urls (list): URLs of the files to download
+        output_dir (str): Directory to store the files in
+        progress_callback (callable, optional): Called as progress_callback(bytes_done, bytes_total)
+            after every chunk written to disk
+        remote_info (dict, optional): Known {url: (size, version)} of the files; the others
+            are requested from the server
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    remote_info = dict(remote_info or {})
+
+    # Byte counter shared by the download workers
+    lock = threading.Lock()
+    bytes_done = 0
+
+    def on_chunk(size):
+        nonlocal bytes_done
+        with lock:
+            bytes_done += size
+            # Report inside the lock so the reported counts never go backwards
+            if progress_callback:
+                progress_callback(bytes_done, bytes_total)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(DOWNLOAD_WORKERS, len(file_urls)))) as executor:
+        # Get the sizes and ETags not known yet so the progress covers all files
+        missing_urls = [url for url in file_urls if url not in remote_info]
+        remote_info.update(zip(missing_urls, executor.map(get_remote_info, missing_urls)))
+        bytes_total = sum(remote_info[url][0] for url in file_urls)
+        logger.info(f"Downloading {len(file_urls)} files ({bytes_total} bytes) to {output_dir}")
+
+        futures = [
+            executor.submit(download_file, url, os.path.join(output_dir, url.split("/")[-1]), remote_info[url][1], on_chunk)
+            for url in file_urls
+        ]
+
+        # Wait for all files, raising the first error
+        for future in futures:
+            future.result()
+
+    logger.info(f"Downloaded {bytes_done} bytes to {output_dir}")
@@ -6,11 +6,13 @@ Handles downloading, checking, and loading the TTS model.
 import logging
 import os
 import threading
+import time
 import torch
 
 from TTS.api import TTS
 
 from app.models.settings import settings
+from app.tts_model.downloader import download_repo_files
 
 # Initialize logger
 logger = logging.getLogger(__name__)
@@ -26,6 +28,17 @@ model_status = {
 MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
 MODEL_TASK = "downloading TTS model"
 
+# Files of the XTTS model, downloaded directly so the progress can be reported
+XTTS_REPO_ID = "coqui/XTTS-v2"
+XTTS_FILES = ["model.pth", "config.json", "vocab.json", "hash.md5", "speakers_xtts.pth"]
+
+# Seconds a cached is_model_downloaded() result stays valid
+MODEL_CHECK_TTL = 60
+
+# Cached is_model_downloaded() results
+# Format: {model_dir: (monotonic timestamp, downloaded)}
+_model_check_cache = {}
+
 def get_model_dir():
     """
     Get the directory where the TTS model should be stored and set the TTS_HOME environment variable.
@@ -45,15 +58,42 @@ def get_model_dir():
 
     return model_dir
 
+def invalidate_model_cache():
+    """
+    Drop the cached is_model_downloaded() results, e.g. after the model files changed.
+    """
+    _model_check_cache.clear()
+
 def is_model_downloaded():
     """
     Check if the TTS model is already downloaded by checking for the existence of model files.
+    The result is cached per model directory for MODEL_CHECK_TTL seconds.
 
     Returns:
         bool: True if the model is downloaded, False otherwise.
     """
     # Get the model directory
     model_dir = get_model_dir()
+
+    # Return the cached result if it is recent enough
+    cached = _model_check_cache.get(model_dir)
+    if cached and time.monotonic() - cached[0] < MODEL_CHECK_TTL:
+        return cached[1]
+
+    downloaded = check_model_files(model_dir)
+    _model_check_cache[model_dir] = (time.monotonic(), downloaded)
+    return downloaded
+
+def check_model_files(model_dir):
+    """
+    Check for the existence of the model files in the model directory.
+
+    Args:
+        model_dir (str): Path to the model directory
+
+    Returns:
+        bool: True if the model is downloaded, False otherwise.
+    """
     logger.debug(f"Checking if model {MODEL_NAME} is downloaded in {model_dir}")
 
     # For XTTS model, check for the existence of required files
@@ -99,9 +139,15 @@ def get_model_status():
 
     return model_status
 
-def download_model_task():
+def download_model_task(progress_callback=None, completion_callback=None):
     """
     Background task to download the TTS model.
+
+    Args:
+        progress_callback (callable, optional): Called as progress_callback(bytes_done, bytes_total)
+            while the model files are downloaded
+        completion_callback (callable, optional): Called without arguments once the task has finished,
+            after model_status has been updated
     """
     try:
         # Update model status to downloading
@@ -112,23 +158,36 @@ def download_model_task():
         model_dir = get_model_dir()
         os.environ["COQUI_TTS_MODELS_DIR"] = os.environ["TTS_HOME"]
 
-        # Download the model
+        # Download the XTTS files ourselves so the progress can be reported
+        if "xtts" in MODEL_NAME:
+            model_path = os.path.join(model_dir, "tts", MODEL_NAME.replace("/", "--"))
+            download_repo_files(XTTS_REPO_ID, XTTS_FILES, model_path, progress_callback)
+
+        # Download the model (or load the files downloaded above)
         tts = TTS(MODEL_NAME)
 
-        # Update model status to downloaded
+        # Update model status to downloaded and drop the cached check result
         model_status['status'] = 'downloaded'
+        invalidate_model_cache()
     except Exception as e:
         # Update model status to failed with error message
         model_status['status'] = 'failed'
         model_status['error'] = str(e)
+    finally:
+        if completion_callback:
+            completion_callback()
 
-def start_model_download(force=True):
+def start_model_download(force=True, progress_callback=None, completion_callback=None):
     """
     Start downloading the TTS model in a background thread.
 
     Args:
         force (bool): If True, allow re-downloading even if the model is already downloaded.
                      Default is True to allow manual re-download.
+        progress_callback (callable, optional): Called from the download thread as
+            progress_callback(bytes_done, bytes_total)
+        completion_callback (callable, optional): Called from the download thread once the
+            download has finished or failed
 
     Returns:
         bool: True if the download was started, False otherwise.
@@ -151,7 +210,7 @@ def start_model_download(force=True):
         model_status['status'] = 'not_downloaded'
 
     # Start the download in a background thread
-    thread = threading.Thread(target=download_model_task)
+    thread = threading.Thread(target=download_model_task, args=(progress_callback, completion_callback))
     thread.daemon = True  # Thread will exit when the main program exits
     thread.start()
     logger.info("Started model download thread")
@@ -0,0 +1,28 @@
+"""Add updated_at index
+
+Revision ID: add_updated_at_index
+Revises: add_description_column
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_updated_at_index'
+down_revision: Union[str, None] = 'add_description_column'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index the routines by last update, which is the order they are listed in
+    op.create_index('idx_routines_updated_at', 'routines', [sa.text('updated_at DESC')])
+
+
+def downgrade() -> None:
+    # Drop the updated_at index
+    op.drop_index('idx_routines_updated_at', table_name='routines')
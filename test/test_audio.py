@@ -1,6 +1,8 @@
 import os
 import pytest
+import queue
 import tempfile
+import threading
 from unittest.mock import patch, MagicMock
 
 from app.audio.audio import AudioGenerator, generate_audio
@@ -197,6 +199,43 @@ class TestAudioGenerator:
         # Verify the progress callback was called
         assert progress_callback.call_count > 0
 
+    def test_worker_stops_when_queue_drained(self):
+        """Test that a worker exits when the last segment is taken after its empty() check"""
+        class DrainedQueue(queue.Queue):
+            def empty(self):
+                return False
+        
+        generator = AudioGenerator(num_threads=1)
+        thread = threading.Thread(
+            target=generator._worker,
+            args=(DrainedQueue(), queue.Queue(), tempfile.gettempdir(), "en", "voice.wav"),
+            daemon=True
+        )
+        thread.start()
+        thread.join(timeout=5)
+        
+        assert not thread.is_alive()
+
+    @patch('app.audio.audio.tempfile.TemporaryDirectory')
+    def test_generate_stopped_by_callback(self, mock_temp_dir, mock_tts_model, mock_audio_segment, temp_output_folder, sample_voice_path, caplog):
+        """Test that an exception from the progress callback is re-raised without an error log"""
+        mock_temp_dir.return_value.__enter__.return_value = os.path.join(temp_output_folder, "temp")
+        os.makedirs(os.path.join(temp_output_folder, "temp"), exist_ok=True)
+        
+        class Stop(Exception):
+            pass
+        
+        generator = AudioGenerator(num_threads=1)
+        with pytest.raises(Stop):
+            generator.generate(
+                text="First line.\nSecond line.",
+                language="en",
+                voice_path=sample_voice_path,
+                progress_callback=MagicMock(side_effect=Stop())
+            )
+        
+        assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
 def test_generate_audio_function(mock_tts_model, mock_audio_segment, temp_output_folder, sample_voice_path):
     """Test the generate_audio function"""
     # Create a progress callback mock
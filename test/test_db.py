@@ -1,8 +1,11 @@
 import os
+import threading
 import pytest
 import logging
-from app.models.routine import get_routine, list_routines, add_routine, update_routine, delete_routine
+from app.models.routine import get_routine, list_routines, list_routine_rows, add_routine, update_routine, delete_routine, \
+    routines_version
 from app.config import DATA_DIR
+from app.models import database
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -101,6 +104,20 @@ def test_update_routine(test_routine_data, cleanup_test_routines):
     
     # Clean up is handled by the cleanup_test_routines fixture
 
+
+def test_update_routine_ignores_unknown_fields(test_routine_data, cleanup_test_routines):
+    """Test updating with unknown fields and updating a missing routine"""
+    test_routine = add_routine(**test_routine_data)
+
+    # Unknown fields and the ID should be ignored
+    updated_routine = update_routine(test_routine['id'], id="other", unknown="value", name="Test Database Renamed")
+    assert updated_routine['id'] == test_routine['id'], "The ID should not be updated"
+    assert updated_routine['name'] == "Test Database Renamed"
+    assert 'unknown' not in updated_routine
+
+    # Updating a routine that does not exist should return None
+    assert update_routine("missing-routine-id", name="Missing") is None
+
 def test_delete_routine(test_routine_data, cleanup_test_routines):
     """Test deleting a routine"""
     # Add a test routine
@@ -116,4 +133,107 @@ def test_delete_routine(test_routine_data, cleanup_test_routines):
     deleted_routine = get_routine(test_routine['id'])
     assert deleted_routine is None, "Deleted routine should not be retrievable"
     
-    # No need for cleanup since we deleted the routine
\ No newline at end of file
+    # Deleting it again should report that it does not exist
+    assert delete_routine(test_routine['id']) is False, "delete_routine should return False for a missing routine"
+
+    # No need for cleanup since we deleted the routine
+
+
+def test_list_routines_cache(test_routine_data, cleanup_test_routines):
+    """Test that the cached routine list follows additions, updates and deletions"""
+    # Load the list into the cache
+    list_routines()
+    version = routines_version()
+
+    # Add a test routine
+    test_routine = add_routine(**test_routine_data)
+    assert test_routine['id'] in list_routines(), "Added routine should be listed"
+    assert routines_version() > version, "Adding a routine should change the routines version"
+
+    # Update the routine
+    update_routine(test_routine['id'], name="Updated Test Database")
+    assert list_routines()[test_routine['id']]['name'] == "Updated Test Database", "Listed routine should be updated"
+
+    # Delete the routine
+    delete_routine(test_routine['id'])
+    assert test_routine['id'] not in list_routines(), "Deleted routine should not be listed"
+
+
+def test_list_routine_rows(test_routine_data, cleanup_test_routines):
+    """Test that routine rows hold the display fields of the routines"""
+    # Add a test routine
+    test_routine = add_routine(**test_routine_data)
+
+    rows = {row.id: row for row in list_routine_rows()}
+    assert test_routine['id'] in rows, "Added routine should have a row"
+
+    row = rows[test_routine['id']]
+    assert row.name == test_routine_data['name'], "Row name should match the routine name"
+    assert row.language_name == "English", "Row language should be the language name"
+    assert row.created_date == test_routine['created_at'][:10], "Row date should be the creation date"
+
+
+def test_list_routines_most_recently_updated_first(test_routine_data, cleanup_test_routines):
+    """Test that routines are listed with the most recently updated one first"""
+    first = add_routine(**test_routine_data)
+    second = add_routine(**test_routine_data)
+
+    # Updating the first routine should move it to the top
+    update_routine(first['id'], name="Test Database First")
+    routine_ids = list(list_routines())
+    assert routine_ids.index(first['id']) < routine_ids.index(second['id'])
+    assert [row.id for row in list_routine_rows()] == routine_ids, "Rows should be in the same order"
+
+
+def test_thread_connections_closed():
+    """Test that the connections of finished threads are closed"""
+    database.get_db_connection()
+    open_connections = len(database._connections)
+
+    # List the routines on a few short-lived threads
+    for _ in range(5):
+        thread = threading.Thread(target=database.list_routines)
+        thread.start()
+        thread.join()
+
+    assert len(database._connections) == open_connections, "Finished threads should not keep connections"
+
+
+def test_write_transaction_rolls_back_failed_commit():
+    """Test that a failed commit does not leave the connection inside the transaction"""
+    conn = database.get_db_connection()
+
+    # Make the commit fail with a deferred foreign key violation
+    conn.execute("PRAGMA foreign_keys=ON")
+    try:
+        conn.execute("CREATE TEMP TABLE fk_parent (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE fk_child (parent_id INTEGER REFERENCES fk_parent(id) DEFERRABLE INITIALLY DEFERRED)")
+        with pytest.raises(database.sqlite3.IntegrityError):
+            with database.write_transaction() as cursor:
+                cursor.execute("INSERT INTO fk_child VALUES (1)")
+        assert not conn.in_transaction, "A failed commit should be rolled back"
+
+        # The next transaction should start normally
+        with database.write_transaction() as cursor:
+            cursor.execute("INSERT INTO fk_parent VALUES (1)")
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.fk_child")
+        conn.execute("DROP TABLE IF EXISTS temp.fk_parent")
+        conn.execute("PRAGMA foreign_keys=OFF")
+
+
+def test_writes_without_returning(test_routine_data, cleanup_test_routines, monkeypatch):
+    """Test adding, updating and deleting routines on SQLite versions without RETURNING"""
+    monkeypatch.setattr(database, '_HAS_RETURNING', False)
+    monkeypatch.setattr(database, '_RETURNING', "")
+    monkeypatch.setattr(database, '_update_sql_cache', {})
+
+    test_routine = database.add_routine(**test_routine_data)
+    assert test_routine['name'] == test_routine_data['name']
+
+    updated_routine = database.update_routine(test_routine['id'], name="Test Database Updated")
+    assert updated_routine['name'] == "Test Database Updated"
+    assert database.update_routine("missing-routine-id", name="Missing") is None
+
+    assert database.pop_routine(test_routine['id'])['id'] == test_routine['id']
+    assert database.delete_routine(test_routine['id']) is False
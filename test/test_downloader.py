@@ -0,0 +1,240 @@
+import os
+import tempfile
+from unittest.mock import patch, MagicMock
+
+import pytest
+import requests
+
+from app.tts_model.downloader import (
+    MANIFEST_FILE, POOL_MAXSIZE, download_file, download_files, download_repo_files,
+    get_manifest, get_remote_info, get_session, prime_connection
+)
+
+# Contents of the mock remote files
+REMOTE_FILES = {
+    "https://example.com/model.pth": b"x" * 2500,
+    "https://example.com/config.json": b"{}",
+}
+
+
+def mock_head(url, **kwargs):
+    response = MagicMock()
+    response.headers = {"content-length": str(len(REMOTE_FILES[url])), "etag": f'"{url}-v1"'}
+    return response
+
+
+def mock_get(url, headers=None, **kwargs):
+    data = REMOTE_FILES[url]
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = 200
+
+    # Serve range requests like a server that supports resuming
+    if headers and "Range" in headers:
+        data = data[int(headers["Range"][len("bytes="):-1]):]
+        response.status_code = 206
+
+    response.iter_content.side_effect = lambda chunk_size: (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    return response
+
+
+@pytest.fixture
+def mock_requests():
+    session = MagicMock()
+    session.head.side_effect = mock_head
+    session.get.side_effect = mock_get
+    with patch('app.tts_model.downloader.get_session', return_value=session), \
+            patch('app.tts_model.downloader.CHUNK_SIZE', 1000):
+        yield session
+
+
+def test_prime_connection_ignores_errors(mock_requests):
+    """Test that prime_connection swallows connection errors"""
+    pool = mock_requests.get_adapter.return_value.poolmanager.connection_from_url.return_value
+    pool.urlopen.side_effect = requests.ConnectionError("offline")
+
+    # Call the function, which must not raise
+    prime_connection()
+    assert pool.urlopen.called
+
+
+def test_get_remote_info(mock_requests):
+    """Test get_remote_info function"""
+    assert get_remote_info("https://example.com/model.pth") == (2500, '"https://example.com/model.pth-v1"')
+
+
+def test_download_files(mock_requests):
+    """Test download_files function"""
+    progress_callback = MagicMock()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = os.path.join(temp_dir, "model")
+
+        # Call the function
+        download_files(list(REMOTE_FILES), output_dir, progress_callback)
+
+        # Verify the files were written
+        for url, data in REMOTE_FILES.items():
+            with open(os.path.join(output_dir, url.split("/")[-1]), "rb") as f:
+                assert f.read() == data
+
+    # Verify the progress was reported against the total size of all files and never went backwards
+    reported = [call.args for call in progress_callback.call_args_list]
+    assert len(reported) == 4
+    assert all(total == 2502 for _, total in reported)
+    assert [done for done, _ in reported] == sorted(done for done, _ in reported)
+    assert reported[-1] == (2502, 2502)
+
+
+def test_get_session_is_shared():
+    """Test that get_session returns one session with a pooled HTTPS adapter"""
+    with patch('app.tts_model.downloader._session', None):
+        session = get_session()
+
+        # Verify the same session is returned on every call
+        assert get_session() is session
+
+        # Verify the adapter keeps a pool of connections
+        adapter = session.get_adapter("https://huggingface.co")
+        assert adapter._pool_maxsize == POOL_MAXSIZE
+
+
+def test_download_file_resumes_partial(mock_requests, tmp_path):
+    """Test that download_file resumes a partial download of the same version"""
+    url = "https://example.com/model.pth"
+    etag = '"https://example.com/model.pth-v1"'
+    file_path = str(tmp_path / "model.pth")
+
+    # Leave a partial download of the same version behind
+    with open(file_path + ".partial", "wb") as f:
+        f.write(REMOTE_FILES[url][:1500])
+    with open(file_path + ".partial.etag", "w") as f:
+        f.write(etag)
+    chunk_callback = MagicMock()
+
+    # Call the function
+    download_file(url, file_path, etag, chunk_callback)
+
+    # Verify only the remaining bytes were requested and the file is complete
+    assert mock_requests.get.call_args.kwargs["headers"] == {"Range": "bytes=1500-"}
+    with open(file_path, "rb") as f:
+        assert f.read() == REMOTE_FILES[url]
+    assert not os.path.exists(file_path + ".partial")
+    assert not os.path.exists(file_path + ".partial.etag")
+    assert sum(call.args[0] for call in chunk_callback.call_args_list) == 2500
+
+
+def test_download_file_restarts_changed_partial(mock_requests, tmp_path):
+    """Test that a partial download of another version is discarded"""
+    url = "https://example.com/model.pth"
+    file_path = str(tmp_path / "model.pth")
+
+    # Leave a partial download of an older version behind
+    with open(file_path + ".partial", "wb") as f:
+        f.write(b"old")
+    with open(file_path + ".partial.etag", "w") as f:
+        f.write('"old"')
+
+    # Call the function
+    download_file(url, file_path, '"new"')
+
+    # Verify the whole file was downloaded again and the new ETag stored
+    assert mock_requests.get.call_args.kwargs["headers"] == {}
+    with open(file_path, "rb") as f:
+        assert f.read() == REMOTE_FILES[url]
+    with open(file_path + ".etag") as f:
+        assert f.read() == '"new"'
+
+
+def test_download_file_interrupted_redownload(mock_requests, tmp_path):
+    """Test that an interrupted download of a changed file does not keep the old file"""
+    url = "https://example.com/model.pth"
+    file_path = str(tmp_path / "model.pth")
+
+    # A complete download of an older version
+    with open(file_path, "wb") as f:
+        f.write(b"OLD")
+    with open(file_path + ".etag", "w") as f:
+        f.write('"v1"')
+
+    # Interrupt the download of the new version after the first chunk
+    def interrupted_get(url, headers=None, **kwargs):
+        response = mock_get(url, headers, **kwargs)
+        chunks = response.iter_content.side_effect
+
+        def iter_content(chunk_size):
+            for i, chunk in enumerate(chunks(chunk_size)):
+                if i == 1:
+                    raise requests.ConnectionError("interrupted")
+                yield chunk
+        response.iter_content.side_effect = iter_content
+        return response
+    mock_requests.get.side_effect = interrupted_get
+    with pytest.raises(requests.ConnectionError):
+        download_file(url, file_path, '"v2"')
+
+    # Verify the old file still carries the old version
+    with open(file_path + ".etag") as f:
+        assert f.read() == '"v1"'
+
+    # Retry, which should resume the new version instead of skipping the file
+    mock_requests.get.side_effect = mock_get
+    download_file(url, file_path, '"v2"')
+    assert mock_requests.get.call_args.kwargs["headers"] == {"Range": "bytes=1000-"}
+    with open(file_path, "rb") as f:
+        assert f.read() == REMOTE_FILES[url]
+    with open(file_path + ".etag") as f:
+        assert f.read() == '"v2"'
+
+
+def test_download_files_skips_unchanged(mock_requests, tmp_path):
+    """Test that download_files skips files that are unchanged since the last download"""
+    output_dir = str(tmp_path)
+    progress_callback = MagicMock()
+
+    # Download once, then again
+    download_files(list(REMOTE_FILES), output_dir)
+    mock_requests.get.reset_mock()
+    download_files(list(REMOTE_FILES), output_dir, progress_callback)
+
+    # Verify nothing was fetched the second time but the progress still completed
+    assert not mock_requests.get.called
+    assert progress_callback.call_args.args == (2502, 2502)
+
+
+# Mock response of the Hugging Face tree API
+MANIFEST = [
+    {"type": "file", "path": "config.json", "size": 2, "oid": "blob1"},
+    {"type": "file", "path": "model.pth", "size": 133, "oid": "blob2", "lfs": {"oid": "sha256", "size": 2500}},
+    {"type": "directory", "path": "samples", "size": 0, "oid": "tree1"},
+]
+
+
+def test_get_manifest_is_cached(mock_requests, tmp_path):
+    """Test that get_manifest fetches the listing once and then reads it from the cache"""
+    mock_requests.get.side_effect = None
+    mock_requests.get.return_value.json.return_value = MANIFEST
+
+    # Call the function twice
+    manifest = get_manifest("coqui/XTTS-v2", "main", str(tmp_path))
+    assert get_manifest("coqui/XTTS-v2", "main", str(tmp_path)) == manifest
+
+    # Verify LFS files use the LFS size and hash and directories are ignored
+    assert manifest == {"config.json": (2, "blob1"), "model.pth": (2500, "sha256")}
+    assert mock_requests.get.call_count == 1
+    assert os.path.exists(tmp_path / MANIFEST_FILE)
+
+
+def test_download_repo_files_uses_manifest(mock_requests, tmp_path):
+    """Test that download_repo_files takes sizes and versions from the manifest"""
+    with patch('app.tts_model.downloader.get_manifest', return_value={"model.pth": (2500, "sha256")}), \
+            patch('app.tts_model.downloader.download_files') as mock_download_files:
+        download_repo_files("coqui/XTTS-v2", ["model.pth", "config.json"], str(tmp_path))
+
+    # Verify only the file missing from the manifest is left for a HEAD request
+    file_urls, output_dir, _, remote_info = mock_download_files.call_args[0]
+    assert file_urls == [
+        "https://huggingface.co/coqui/XTTS-v2/resolve/main/model.pth",
+        "https://huggingface.co/coqui/XTTS-v2/resolve/main/config.json",
+    ]
+    assert remote_info == {"https://huggingface.co/coqui/XTTS-v2/resolve/main/model.pth": (2500, "sha256")}
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+from app.models.settings import Settings
+
+
+@pytest.fixture
+def temp_settings():
+    """Fixture providing a Settings instance backed by a temporary settings file"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_settings = Settings()
+        test_settings.settings_file = os.path.join(temp_dir, "settings.json")
+        yield test_settings
+
+
+def test_get_many(temp_settings):
+    """Test getting several settings at once"""
+    temp_settings.settings.pop('break_pause_duration', None)
+
+    values = temp_settings.get_many(('default_language', 'break_pause_duration'))
+
+    assert values['default_language'] == temp_settings.get('default_language')
+    assert values['break_pause_duration'] == Settings.DEFAULT_SETTINGS['break_pause_duration'], \
+        "Missing settings should fall back to the defaults"
+
+
+def test_set_many(temp_settings):
+    """Test setting several settings at once"""
+    temp_settings.set_many({'audio_threads': 8, 'heading_pause_duration': 3})
+    assert not os.path.exists(temp_settings.settings_file), "Setting values should not write the file"
+
+    assert temp_settings.save_settings_if_dirty()
+    with open(temp_settings.settings_file, 'r') as f:
+        saved = json.load(f)
+    assert saved['audio_threads'] == 8
+    assert saved['heading_pause_duration'] == 3
+
+
+def test_directories_created_once(temp_settings, monkeypatch):
+    """Test that the data and output folders are only created once per path"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_settings.settings['data_dir'] = os.path.join(temp_dir, "data")
+        assert os.path.isdir(temp_settings.get_output_folder())
+
+        # Further lookups of the same directories should not touch the file system
+        calls = []
+        monkeypatch.setattr(os, 'makedirs', lambda *args, **kwargs: calls.append(args))
+        temp_settings.get_data_dir()
+        temp_settings.get_output_folder()
+        assert calls == []
+
+        # A new data directory is created again
+        temp_settings.settings['data_dir'] = os.path.join(temp_dir, "other")
+        temp_settings.get_data_dir()
+        assert len(calls) == 1
+
+
+def test_save_settings_if_dirty(temp_settings):
+    """Test that the settings file is only written when a value changed"""
+    temp_settings.set('audio_threads', temp_settings.get('audio_threads'))
+    temp_settings.save_settings_if_dirty()
+    assert not os.path.exists(temp_settings.settings_file), "Unchanged values should not be saved"
+
+    temp_settings.set('audio_threads', 2)
+    temp_settings.save_settings_if_dirty()
+    assert os.path.exists(temp_settings.settings_file)
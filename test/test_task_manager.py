@@ -190,6 +190,46 @@ class TestBaseTaskManager:
         # Verify notifier was called
         assert task_id in mock_task_notifier.started_tasks
     
+    def test_progress_updates_throttled(self, mock_task_notifier, mock_generate_audio, mock_routine_functions):
+        """Test that progress updates without a new percentage are dropped"""
+        def generate(progress_callback, **kwargs):
+            for segment in range(1, 201):
+                progress_callback(segment // 2, f"Processing segments: {segment} / 200")
+            return "test_output.wav"
+        mock_generate_audio.side_effect = generate
+        
+        manager = BaseTaskManager(mock_task_notifier)
+        manager._run_task("task", "Test text", "en", "/path/to/voice.wav", "Test Routine")
+        
+        # Verify each percentage from the generator is reported once
+        generator_updates = [update for update in mock_task_notifier.progress_updates
+                             if update[2].startswith("Processing segments")]
+        assert [percent for _, percent, _ in generator_updates] == list(range(101))
+        assert mock_task_notifier.completed_tasks
+    
+    def test_cancel_during_generation(self, mock_task_notifier, mock_generate_audio, mock_routine_functions):
+        """Test that cancelling stops the generation at its next progress update"""
+        manager = BaseTaskManager(mock_task_notifier)
+        generated = []
+        
+        def generate(progress_callback, **kwargs):
+            for segment in range(10):
+                if segment == 3:
+                    manager.cancel_event.set()
+                progress_callback(segment * 10, f"Processing segments: {segment} / 10")
+                generated.append(segment)
+            return "test_output.wav"
+        mock_generate_audio.side_effect = generate
+        
+        manager._run_task("task", "Test text", "en", "/path/to/voice.wav", "Test Routine")
+        
+        # Verify the generation stopped and the task was reported as cancelled
+        mock_add, mock_update, _ = mock_routine_functions
+        assert generated == [0, 1, 2]
+        assert mock_task_notifier.failed_tasks == [("task", "Task cancelled")]
+        assert not mock_add.called and not mock_update.called
+        assert manager.cancel_requested is False
+    
     def test_cleanup_temp_file(self, mock_task_notifier, tmp_path):
         """Test _cleanup_temp_file method"""
         manager = BaseTaskManager(mock_task_notifier)
@@ -213,8 +253,8 @@ class TestBaseTaskManager:
         # Verify the file exists before cleanup
         assert temp_file.exists(), "File should exist before cleanup"
         
-        # Call the cleanup method
-        manager._cleanup_temp_file("upload", str(temp_file))
+        # Call the cleanup method and wait for the background removal
+        manager._cleanup_temp_file("upload", str(temp_file)).result()
         
         # Verify the file was removed
         assert not os.path.exists(str(temp_file)), "File with 'temp_' in name should be removed"
@@ -241,6 +281,52 @@ class TestQtTaskManager:
         assert hasattr(manager, 'task_completed')
         assert hasattr(manager, 'task_failed')
 
+    def test_task_runs_on_thread_pool(self, qtbot, mock_generate_audio, mock_routine_functions):
+        """Test that a task runs on the task thread pool and reports completion"""
+        manager = QtTaskManager()
+        completed = []
+        manager.task_completed.connect(completed.append)
+
+        manager.start_task(
+            text="Test text",
+            language="en",
+            voice_path="/path/to/voice.wav",
+            routine_name="Test Routine"
+        )
+        assert manager.is_task_running()
+
+        # Verify the task finishes and the result is delivered
+        qtbot.waitUntil(lambda: not manager.is_task_running())
+        qtbot.waitUntil(lambda: len(completed) > 0)
+        assert completed[0]['filename'] == "test_output.wav"
+
+class TestQtTaskProgressNotifier:
+    def test_progress_is_coalesced(self, qtbot):
+        """Test that only the latest progress update of an interval is emitted"""
+        notifier = QtTaskProgressNotifier()
+        received = []
+        notifier.task_progress.connect(lambda percent, message: received.append((percent, message)))
+
+        # Send a burst of progress updates
+        for percent in range(100):
+            notifier.notify_progress("task", percent, f"Step {percent}")
+
+        # Verify only the last update is delivered once the timer fires
+        qtbot.waitUntil(lambda: len(received) > 0)
+        assert received == [(99, "Step 99")]
+
+    def test_pending_progress_emitted_before_completion(self, qtbot):
+        """Test that pending progress is emitted before the completed signal"""
+        notifier = QtTaskProgressNotifier()
+        received = []
+        notifier.task_progress.connect(lambda percent, message: received.append(("progress", percent)))
+        notifier.task_completed.connect(lambda result: received.append(("completed", result)))
+
+        notifier.notify_progress("task", 50, "Halfway")
+        notifier.notify_completed("task", {"done": True})
+
+        assert received == [("progress", 50), ("completed", {"done": True})]
+
 class TestFileTaskManager:
     def test_init(self):
         """Test FileTaskManager initialization"""
@@ -4,7 +4,7 @@ import tempfile
 from unittest.mock import patch, MagicMock
 
 from app.tts_model.tts_model import (
-    get_model_dir, is_model_downloaded, get_model_status,
+    get_model_dir, is_model_downloaded, invalidate_model_cache, get_model_status,
     download_model_task, start_model_download, get_tts_model,
     MODEL_NAME
 )
@@ -34,6 +34,11 @@ def mock_torch():
         mock_torch.cuda = MockCuda
         yield mock_torch
 
+@pytest.fixture
+def mock_download_files():
+    with patch('app.tts_model.tts_model.download_repo_files') as mock_download:
+        yield mock_download
+
 @pytest.fixture
 def temp_model_dir():
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -46,7 +51,10 @@ def temp_model_dir():
             model_subdir = os.path.join(model_dir, "tts", MODEL_NAME.replace("/", "--"))
             os.makedirs(model_subdir, exist_ok=True)
             
+            # Make sure a cached result from another directory is not reused
+            invalidate_model_cache()
             yield model_dir, model_subdir
+            invalidate_model_cache()
 
 def test_get_model_dir(temp_model_dir):
     """Test get_model_dir function"""
@@ -83,6 +91,24 @@ def test_is_model_downloaded_downloaded(temp_model_dir):
     # Verify the result
     assert result is True
 
+def test_is_model_downloaded_cached(temp_model_dir):
+    """Test that is_model_downloaded caches its result until the cache is invalidated"""
+    _, model_subdir = temp_model_dir
+
+    # The first check finds no model files
+    assert is_model_downloaded() is False
+
+    # Create the required files
+    required_files = ["model.pth", "config.json", "vocab.json", "speakers_xtts.pth"]
+    for file in required_files:
+        with open(os.path.join(model_subdir, file), 'w') as f:
+            f.write("Mock model file")
+
+    # The cached result is returned until the cache is invalidated
+    assert is_model_downloaded() is False
+    invalidate_model_cache()
+    assert is_model_downloaded() is True
+
 def test_get_model_status_not_downloaded():
     """Test get_model_status function when model is not downloaded"""
     with patch('app.tts_model.tts_model.is_model_downloaded', return_value=False):
@@ -105,7 +131,7 @@ def test_get_model_status_downloaded():
             assert result['status'] == 'downloaded'
             assert result['error'] is None
 
-def test_download_model_task(mock_tts, temp_model_dir):
+def test_download_model_task(mock_tts, mock_download_files, temp_model_dir):
     """Test download_model_task function"""
     with patch('app.tts_model.tts_model.model_status', {'status': 'not_downloaded', 'error': None}):
         # Call the function
@@ -116,7 +142,29 @@ def test_download_model_task(mock_tts, temp_model_dir):
         assert model_status['status'] == 'downloaded'
         assert model_status['error'] is None
 
-def test_download_model_task_error(mock_tts, temp_model_dir):
+def test_download_model_task_callbacks(mock_tts, mock_download_files, temp_model_dir):
+    """Test that download_model_task passes on the progress callback and calls the completion callback"""
+    _, model_subdir = temp_model_dir
+    progress_callback = MagicMock()
+    completion_callback = MagicMock()
+
+    with patch('app.tts_model.tts_model.model_status', {'status': 'not_downloaded', 'error': None}):
+        # Call the function
+        download_model_task(progress_callback, completion_callback)
+
+        # Verify the files were downloaded into the model subdirectory with the progress callback
+        repo_id, files, output_dir, callback = mock_download_files.call_args[0]
+        assert repo_id == "coqui/XTTS-v2"
+        assert "model.pth" in files
+        assert output_dir == model_subdir
+        assert callback is progress_callback
+
+        # Verify the completion callback was called once the status was updated
+        from app.tts_model.tts_model import model_status
+        assert model_status['status'] == 'downloaded'
+        completion_callback.assert_called_once_with()
+
+def test_download_model_task_error(mock_tts, mock_download_files, temp_model_dir):
     """Test download_model_task function when an error occurs"""
     with patch('app.tts_model.tts_model.model_status', {'status': 'not_downloaded', 'error': None}):
         with patch('app.tts_model.tts_model.TTS', side_effect=Exception("Test error")):